@@ -4,24 +4,43 @@ FastAPI Backend Service
 """
 
 import asyncio
+import hmac
 import json
 import logging
 import os
 import time
-from pathlib import Path
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
-import re
+import tracemalloc
+import uuid
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import requests
-from bs4 import BeautifulSoup
-# from transformers import pipeline  # Removed to implement lazy loading
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from cachetools import TTLCache
 import uvicorn
 
+from sentiment import inference
+from sentiment.config import (
+    ADMIN_TOKEN, CACHE_FILE, DATA_DIR, INFERENCE_WORKERS, SCRAPER_BACKEND, SENTIMENT_BACKEND, SMARTPHONES_FILE
+)
+from sentiment.history import history_store
+from sentiment.identity import product_index
+from sentiment.inference import analyze_sentiment_batch, initialize_sentiment_pipeline, sentiment_model_ready, start_inference_queue
+from sentiment.profiling import SamplingProfiler
+from sentiment.schemas import (
+    AnalyzeRequest, AnalyzeResponse, HistoryResponse, JobStage, JobStatus, ProfileAllocation, ProfileResponse,
+    RefreshResponse, ReviewScore, ReviewsPage, ScoringFormulaInfo, SmartphoneData
+)
+from sentiment.scoring import (
+    DEFAULT_SCORING_FORMULA, SCORING_FORMULAS, RankingIndex, calculate_composite_score, merge_variant_listings,
+    score_smartphone
+)
+from sentiment.scraper import create_scraper
+from sentiment.storage import load_smartphones_data, review_store, save_smartphones_data, sentiment_bucket
+from sentiment.text import clean_text, review_filter
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -43,89 +62,14 @@ app.add_middleware(
 )
 
 # Global variables
-sentiment_pipeline = None
+ranking_index = None  # RankingIndex of the last committed refresh
 cache = TTLCache(maxsize=100, ttl=3600)  # 1 hour TTL
-
-# Data storage configuration
-DATA_DIR = Path("../data")
-DATA_DIR.mkdir(exist_ok=True)
-SMARTPHONES_FILE = DATA_DIR / "smartphones_data.json"
-CACHE_FILE = DATA_DIR / "cache_backup.json"
-
-# Pydantic models
-class SmartphoneData(BaseModel):
-    name: str
-    link: str
-    price: Optional[str] = None
-    rating: Optional[float] = None
-    review_count: Optional[int] = None
-    average_sentiment: float
-    positive_ratio: float
-    composite_score: float
-    last_updated: datetime
-
-class RefreshResponse(BaseModel):
-    detail: str
-    timestamp: datetime
+TOP_MOBILES_CACHE_KEY = "top_mobiles"
+refresh_jobs = TTLCache(maxsize=50, ttl=86400)  # Finished jobs stay queryable for a day
+current_refresh_job = None
+profiling_active = False
 
 # Persistent storage functions
-def save_smartphones_data(data: List[SmartphoneData]):
-    """Save smartphones data to JSON file"""
-    try:
-        # Convert Pydantic models to dict for JSON serialization
-        data_dict = []
-        for item in data:
-            item_dict = item.dict()
-            # Convert datetime to string for JSON serialization
-            if isinstance(item_dict.get('last_updated'), datetime):
-                item_dict['last_updated'] = item_dict['last_updated'].isoformat()
-            data_dict.append(item_dict)
-
-        # Save to file with timestamp
-        save_data = {
-            "timestamp": datetime.now().isoformat(),
-            "data": data_dict
-        }
-
-        with open(SMARTPHONES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, indent=2, ensure_ascii=False)
-
-        logger.info(f"✅ Saved {len(data)} smartphones to {SMARTPHONES_FILE}")
-
-    except Exception as e:
-        logger.error(f"❌ Error saving smartphones data: {e}")
-
-def load_smartphones_data() -> Optional[List[SmartphoneData]]:
-    """Load smartphones data from JSON file"""
-    try:
-        if not SMARTPHONES_FILE.exists():
-            logger.info("No saved smartphones data found")
-            return None
-
-        with open(SMARTPHONES_FILE, 'r', encoding='utf-8') as f:
-            saved_data = json.load(f)
-
-        # Check if data is recent (within 2 hours)
-        saved_timestamp = datetime.fromisoformat(saved_data['timestamp'])
-        if datetime.now() - saved_timestamp > timedelta(hours=2):
-            logger.info("Saved data is too old, will fetch fresh data")
-            return None
-
-        # Convert back to Pydantic models
-        smartphones = []
-        for item_dict in saved_data['data']:
-            # Convert string back to datetime
-            if 'last_updated' in item_dict:
-                item_dict['last_updated'] = datetime.fromisoformat(item_dict['last_updated'])
-            smartphones.append(SmartphoneData(**item_dict))
-
-        logger.info(f"✅ Loaded {len(smartphones)} smartphones from {SMARTPHONES_FILE}")
-        return smartphones
-
-    except Exception as e:
-        logger.error(f"❌ Error loading smartphones data: {e}")
-        return None
-
 def save_cache_backup():
     """Save current cache to backup file"""
     try:
@@ -142,373 +86,15 @@ def save_cache_backup():
     except Exception as e:
         logger.error(f"❌ Error saving cache backup: {e}")
 
-# Initialize sentiment analysis pipeline
-def initialize_sentiment_pipeline():
-    """Initialize the sentiment analysis pipeline"""
-    global sentiment_pipeline
-    if sentiment_pipeline is None:
-        logger.info("Loading sentiment analysis model...")
-        try:
-            from transformers import pipeline  # Import here for lazy loading
-            sentiment_pipeline = pipeline(
-                "sentiment-analysis",
-                model="distilbert-base-uncased-finetuned-sst-2-english",
-                return_all_scores=True
-            )
-            logger.info("✅ Sentiment analysis model loaded successfully")
-        except Exception as e:
-            logger.error(f"❌ Failed to load sentiment model: {e}")
-            raise
-
-def clean_text(text: str) -> str:
-    """Clean and normalize text for sentiment analysis"""
-    if not text:
-        return ""
-    
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    # Remove special characters but keep basic punctuation
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
-    
-    return text[:512]  # Limit to model's max length
-
-class AmazonScraper:
-    """Amazon scraper for smartphones and reviews"""
-    
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
-    
-    def get_bestseller_smartphones(self, limit: int = 20) -> List[Dict]:
-        """Scrape Amazon India's bestseller smartphones"""
-        url = "https://www.amazon.in/gp/bestsellers/electronics/1805560031"
-
-        try:
-            logger.info(f"Scraping bestsellers from: {url}")
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'lxml')
-            smartphones = []
-
-            # First try: Look for direct product links with smartphone keywords
-            logger.info("Trying direct product link extraction...")
-            product_links = soup.find_all('a', href=re.compile(r'/dp/'))
-
-            for i, link in enumerate(product_links):
-                try:
-                    name = link.get_text(strip=True)
-                    href = link.get('href', '')
-
-                    if name and len(name) > 15:  # Reasonable product name length
-                        name_lower = name.lower()
-                        # Check for smartphone keywords
-                        smartphone_keywords = ['phone', 'mobile', 'smartphone', 'iphone', 'samsung', 'oneplus', 'xiaomi', 'oppo', 'vivo', 'realme', 'redmi', 'poco', 'motorola', 'nokia', 'huawei', 'honor']
-
-                        if any(keyword in name_lower for keyword in smartphone_keywords):
-                            if not href.startswith('http'):
-                                href = f"https://www.amazon.in{href}"
-
-                            # Try to find price in the parent container
-                            price = None
-                            parent = link.find_parent()
-                            for _ in range(5):  # Look up to 5 levels up
-                                if parent:
-                                    price_elem = parent.find('span', string=re.compile(r'₹|Rs'))
-                                    if not price_elem:
-                                        price_elem = parent.find('span', class_=re.compile(r'price'))
-                                    if price_elem:
-                                        price = price_elem.get_text(strip=True)
-                                        break
-                                    parent = parent.find_parent()
-                                else:
-                                    break
-
-                            smartphones.append({
-                                'name': name,
-                                'link': href,
-                                'price': price,
-                                'rating': None,
-                                'rank': len(smartphones) + 1
-                            })
-                            logger.info(f"✅ Extracted: {name[:60]}...")
-
-                            if len(smartphones) >= limit:
-                                break
-
-                except Exception as e:
-                    logger.warning(f"Error processing link {i}: {e}")
-                    continue
-
-            if smartphones:
-                logger.info(f"Successfully extracted {len(smartphones)} smartphones using direct link method")
-                return smartphones[:limit]
-
-            # Second try: Container-based approach
-            logger.info("Trying container-based extraction...")
-            selectors = [
-                'div[data-asin]',
-                'div[id*="gridItemRoot"]',
-                'div[class*="zg-item"]'
-            ]
-
-            product_containers = []
-            for selector in selectors:
-                try:
-                    containers = soup.select(selector)
-                    if containers:
-                        product_containers = containers
-                        logger.info(f"Found {len(containers)} containers using selector: {selector}")
-                        break
-                except Exception as e:
-                    logger.warning(f"Selector {selector} failed: {e}")
-                    continue
-
-            if not product_containers:
-                logger.warning("No product containers found with any selector")
-                return []
-
-            logger.info(f"Found {len(product_containers)} product containers")
-
-            for i, container in enumerate(product_containers[:limit]):
-                try:
-                    # Look for product links within container
-                    link_elem = container.find('a', href=re.compile(r'/dp/'))
-                    if not link_elem:
-                        continue
-
-                    name = link_elem.get_text(strip=True)
-                    link = link_elem.get('href', '')
-
-                    if not name or len(name) < 15:
-                        continue
-
-                    # Filter for smartphone keywords
-                    name_lower = name.lower()
-                    smartphone_keywords = ['phone', 'mobile', 'smartphone', 'iphone', 'samsung', 'oneplus', 'xiaomi', 'oppo', 'vivo', 'realme', 'redmi', 'poco', 'motorola', 'nokia']
-
-                    if not any(keyword in name_lower for keyword in smartphone_keywords):
-                        continue
-
-                    if link and not link.startswith('http'):
-                        link = f"https://www.amazon.in{link}"
-
-                    # Extract price
-                    price = None
-                    price_selectors = [
-                        'span[class*="price"]',
-                        '.a-price-whole',
-                        '.a-price',
-                        'span[class*="symbol"]'
-                    ]
-
-                    for price_sel in price_selectors:
-                        try:
-                            price_elem = container.select_one(price_sel)
-                            if price_elem:
-                                price_text = price_elem.get_text(strip=True)
-                                if '₹' in price_text or 'Rs' in price_text:
-                                    price = price_text
-                                    break
-                        except:
-                            continue
-
-                    # Extract rating
-                    rating = None
-                    rating_elem = container.find('span', {'class': re.compile(r'.*rating.*|.*star.*')})
-                    if rating_elem:
-                        rating_text = rating_elem.get_text(strip=True)
-                        rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                        if rating_match:
-                            try:
-                                rating = float(rating_match.group(1))
-                                if rating > 5:  # Probably out of 5 scale
-                                    rating = rating / 10 * 5
-                            except:
-                                pass
-
-                    smartphones.append({
-                        'name': name,
-                        'link': link,
-                        'price': price,
-                        'rating': rating,
-                        'rank': len(smartphones) + 1
-                    })
-                    logger.info(f"✅ Container extracted: {name[:60]}...")
-
-                except Exception as e:
-                    logger.warning(f"Error extracting from container {i}: {e}")
-                    continue
-
-            logger.info(f"Successfully extracted {len(smartphones)} smartphones")
-            return smartphones
-
-        except Exception as e:
-            logger.error(f"Error scraping bestsellers: {e}")
-            return []
-    
-    def get_product_reviews(self, product_link: str, max_reviews: int = 50) -> List[str]:
-        """Extract reviews for a specific product"""
-        if not product_link:
-            return []
-
-        try:
-            # Convert product link to reviews link
-            if '/dp/' in product_link:
-                product_id = product_link.split('/dp/')[1].split('/')[0]
-                reviews_url = f"https://www.amazon.in/product-reviews/{product_id}?reviewerType=all_reviews&language=en_IN&sortBy=recent"
-            else:
-                return []
-
-            logger.info(f"Fetching reviews from: {reviews_url}")
-            response = self.session.get(reviews_url, timeout=15)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'lxml')
-            reviews = []
-
-            # Try multiple selectors for review containers
-            review_selectors = [
-                'div[data-hook="review"]',
-                'div[class*="review"]',
-                'div[id*="review"]',
-                '.review-item',
-                '.cr-original-review-text'
-            ]
-
-            review_containers = []
-            for selector in review_selectors:
-                try:
-                    containers = soup.select(selector)
-                    if containers:
-                        review_containers = containers
-                        logger.info(f"Found {len(containers)} review containers using: {selector}")
-                        break
-                except:
-                    continue
-
-            if not review_containers:
-                # Fallback: look for any text that looks like reviews
-                logger.info("Trying fallback review extraction...")
-                all_spans = soup.find_all('span')
-                for span in all_spans:
-                    text = span.get_text(strip=True)
-                    if len(text) > 50 and len(text) < 1000:  # Reasonable review length
-                        # Check if it looks like a review (contains common review words)
-                        review_indicators = ['good', 'bad', 'excellent', 'poor', 'love', 'hate', 'recommend', 'buy', 'purchase', 'quality', 'price', 'value', 'phone', 'mobile']
-                        if any(indicator in text.lower() for indicator in review_indicators):
-                            cleaned_text = clean_text(text)
-                            if len(cleaned_text) > 20:
-                                reviews.append(cleaned_text)
-                                if len(reviews) >= max_reviews:
-                                    break
-
-                # If still no reviews found, use mock reviews for demonstration
-                if not reviews:
-                    logger.warning("No reviews found, using mock reviews for demonstration")
-                    mock_reviews = [
-                        "Great product, very satisfied with the quality and performance.",
-                        "Good value for money, works as expected.",
-                        "Fast delivery and excellent build quality.",
-                        "Highly recommended, meets all my requirements.",
-                        "Decent product but could be better in some aspects.",
-                        "Amazing phone with great camera quality.",
-                        "Battery life is excellent, lasts all day.",
-                        "Fast charging feature is very convenient.",
-                        "Display quality is outstanding and vibrant.",
-                        "Performance is smooth for gaming and apps."
-                    ]
-                    reviews = mock_reviews[:max_reviews]
-            else:
-                # Extract from found containers
-                for container in review_containers[:max_reviews]:
-                    try:
-                        # Try multiple selectors for review text
-                        text_selectors = [
-                            'span[data-hook="review-body"]',
-                            '.cr-original-review-text',
-                            '.review-text',
-                            'span[class*="review"]',
-                            'div[class*="text"]'
-                        ]
-
-                        review_text = None
-                        for text_sel in text_selectors:
-                            review_elem = container.select_one(text_sel)
-                            if review_elem:
-                                review_text = review_elem.get_text(strip=True)
-                                break
-
-                        if not review_text:
-                            # Get all text from container
-                            review_text = container.get_text(strip=True)
-
-                        if review_text:
-                            cleaned_text = clean_text(review_text)
-                            if len(cleaned_text) > 20:  # Minimum length filter
-                                reviews.append(cleaned_text)
-
-                    except Exception as e:
-                        logger.warning(f"Error extracting review: {e}")
-                        continue
-
-            logger.info(f"Extracted {len(reviews)} reviews")
-            return reviews
-
-        except Exception as e:
-            logger.error(f"Error fetching reviews for {product_link}: {e}")
-            return []
-
-def analyze_sentiment_batch(reviews: List[str]) -> Dict:
-    """Analyze sentiment for a batch of reviews"""
-    if not reviews or not sentiment_pipeline:
-        return {'average_sentiment': 0.5, 'positive_ratio': 0.5}
-    
-    try:
-        # Analyze sentiment for all reviews
-        results = sentiment_pipeline(reviews)
-        
-        positive_count = 0
-        sentiment_scores = []
-        
-        for result in results:
-            # Extract positive score
-            positive_score = next((item['score'] for item in result if item['label'] == 'POSITIVE'), 0.5)
-            sentiment_scores.append(positive_score)
-            
-            if positive_score > 0.5:
-                positive_count += 1
-        
-        average_sentiment = sum(sentiment_scores) / len(sentiment_scores)
-        positive_ratio = positive_count / len(reviews)
-        
-        return {
-            'average_sentiment': average_sentiment,
-            'positive_ratio': positive_ratio
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in sentiment analysis: {e}")
-        return {'average_sentiment': 0.5, 'positive_ratio': 0.5}
-
-def calculate_composite_score(rank: int, positive_ratio: float) -> float:
-    """Calculate composite score based on rank and sentiment"""
-    # Normalize rank (lower rank = higher score)
-    rank_score = 1.0 / rank if rank > 0 else 0
-    
-    # Composite score: 40% rank, 60% sentiment
-    composite_score = 0.4 * rank_score + 0.6 * positive_ratio
-    
-    return round(composite_score, 4)
+def rank_smartphones(smartphones_data: List[SmartphoneData], formula: str) -> List[SmartphoneData]:
+    """Rank the current results under a scoring formula"""
+    global ranking_index
+    if formula == DEFAULT_SCORING_FORMULA:
+        return smartphones_data
+    if ranking_index is None:
+        # Only the stored top 10 survive a restart; rank those until the next refresh
+        ranking_index = RankingIndex.from_models(smartphones_data)
+    return ranking_index.top_models(formula, 10)
 
 def get_mock_smartphone_data() -> List[SmartphoneData]:
     """Generate mock smartphone data for demonstration"""
@@ -575,81 +161,298 @@ def get_mock_smartphone_data() -> List[SmartphoneData]:
 
     return processed_data
 
-async def process_smartphones_data() -> List[SmartphoneData]:
-    """Process smartphones data with sentiment analysis"""
-    scraper = AmazonScraper()
+async def stream_smartphones_data() -> AsyncIterator[Dict]:
+    """Process smartphones one at a time, yielding events as each is scored
+
+    Yields ``start``, then a ``product`` and ``progress`` event per smartphone,
+    and finally ``complete`` with the ranked top 10. Blocking scraping and
+    inference run in a worker thread so the event loop can flush each event.
+    """
+    scraper = create_scraper()
 
     # Get bestseller smartphones
-    smartphones = scraper.get_bestseller_smartphones(limit=20)
+    smartphones = await asyncio.to_thread(scraper.get_bestseller_smartphones, 20)
 
     # If scraping fails, raise an error instead of using mock data
     if not smartphones:
         logger.error("Scraping failed - no smartphones found")
         raise HTTPException(status_code=500, detail="Failed to scrape real smartphone data from Amazon")
 
-    processed_data = []
+    # Variant listings of the same phone are scored once, at their best rank
+    smartphones = merge_variant_listings(smartphones)
+
+    total = len(smartphones)
+    yield {'event': 'start', 'data': {'total': total}}
+
+    # Rankings under every formula are kept current as each product is scored
+    ranking = RankingIndex()
 
-    for phone in smartphones:
+    for index, phone in enumerate(smartphones, 1):
         try:
-            logger.info(f"Processing: {phone['name'][:50]}...")
-
-            # Get reviews
-            reviews = scraper.get_product_reviews(phone['link'], max_reviews=50)
-
-            # If no reviews found, use mock reviews
-            if not reviews:
-                reviews = [
-                    "Good phone with decent features",
-                    "Value for money product",
-                    "Camera quality is satisfactory",
-                    "Battery life is okay",
-                    "Build quality could be better"
-                ]
-
-            # Analyze sentiment
-            sentiment_data = analyze_sentiment_batch(reviews)
-
-            # Calculate composite score
-            composite_score = calculate_composite_score(
-                phone['rank'],
-                sentiment_data['positive_ratio']
-            )
-
-            smartphone_data = SmartphoneData(
-                name=phone['name'],
-                link=phone['link'],
-                price=phone.get('price'),
-                rating=phone.get('rating'),
-                review_count=len(reviews),
-                average_sentiment=round(sentiment_data['average_sentiment'], 4),
-                positive_ratio=round(sentiment_data['positive_ratio'], 4),
-                composite_score=composite_score,
-                last_updated=datetime.now()
-            )
-
-            processed_data.append(smartphone_data)
+            scored = await asyncio.to_thread(score_smartphone, scraper, phone)
+            ranking.update(scored)
+            yield {'event': 'product', 'data': scored.to_dict()}
 
             # Add small delay to be respectful
-            await asyncio.sleep(1)
+            await asyncio.sleep(scraper.request_delay)
 
         except Exception as e:
-            logger.error(f"Error processing {phone['name']}: {e}")
-            continue
+            logger.error(f"Error processing {phone.name}: {e}")
+
+        yield {'event': 'progress', 'data': {'processed': index, 'total': total, 'scored': len(ranking)}}
 
     # If no data was processed, raise an error
-    if not processed_data:
+    if not ranking:
         logger.error("No smartphone data could be processed")
         raise HTTPException(status_code=500, detail="Failed to process any smartphone data")
 
-    # Sort by composite score (descending)
-    processed_data.sort(key=lambda x: x.composite_score, reverse=True)
+    # Only the top 10 become response models
+    yield {'event': 'complete', 'data': ranking.top_models(DEFAULT_SCORING_FORMULA, 10), 'ranking': ranking}
 
-    return processed_data[:10]  # Return top 10
+async def process_smartphones_data() -> List[SmartphoneData]:
+    """Process smartphones data with sentiment analysis"""
+    ranked_data = []
+    async for event in stream_smartphones_data():
+        if event['event'] == 'complete':
+            ranked_data = event['data']
+    return ranked_data
+
+def commit_smartphones_data(smartphones_data: List[SmartphoneData], ranking: Optional[RankingIndex] = None):
+    """Cache fresh results and write them to persistent storage"""
+    global ranking_index
+
+    # Cache the results
+    cache[TOP_MOBILES_CACHE_KEY] = smartphones_data
+    ranking_index = ranking
+
+    # Save to persistent storage
+    save_smartphones_data(smartphones_data)
+
+    # Backup cache
+    save_cache_backup()
+
+    # Append the ranking snapshot to the history store
+    try:
+        history_store.append_snapshot(smartphones_data)
+    except Exception as e:
+        logger.error(f"❌ Error appending sentiment history: {e}")
+
+def format_sse(event: str, data) -> str:
+    """Format a Server-Sent Event message"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), ensure_ascii=False)}\n\n"
+
+class RefreshJob:
+    """A tracked run of the scrape-and-score pipeline
+
+    Events from ``stream_smartphones_data`` are recorded so that any number of
+    subscribers (SSE clients, ``/top-mobiles`` waiters) can share one run.
+    """
+
+    STAGES = ('scrape', 'score', 'commit')
+
+    def __init__(self):
+        self.job_id = uuid.uuid4().hex
+        self.status = 'queued'
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.stages = {name: JobStage(name=name, status='pending') for name in self.STAGES}
+        self.processed = 0
+        self.total: Optional[int] = None
+        self.result: Optional[List[SmartphoneData]] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict] = []
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('completed', 'failed')
+
+    def _start_stage(self, name: str):
+        stage = self.stages[name]
+        stage.status = 'running'
+        stage.started_at = datetime.now()
+
+    def _finish_stage(self, name: str, status: str = 'completed'):
+        stage = self.stages[name]
+        stage.status = status
+        stage.finished_at = datetime.now()
+        if stage.started_at:
+            stage.duration_seconds = round((stage.finished_at - stage.started_at).total_seconds(), 3)
+
+    async def _publish(self, event: Dict):
+        async with self._changed:
+            self.events.append(event)
+            self._changed.notify_all()
+
+    def _fail(self, detail: str):
+        """Mark the job failed; subscribers are woken when run() finishes"""
+        self.error = detail
+        logger.error(f"❌ Refresh job {self.job_id} failed: {detail}")
+        for name, stage in self.stages.items():
+            if stage.status == 'running':
+                self._finish_stage(name, 'failed')
+        self.status = 'failed'
+        self.events.append({'event': 'error', 'data': {'detail': detail}})
+
+    async def run(self):
+        """Run the pipeline, recording stage timings and committing the results"""
+        self.status = 'running'
+        self.started_at = datetime.now()
+        self._start_stage('scrape')
+        logger.info(f"Refresh job {self.job_id} started")
+
+        try:
+            async for event in stream_smartphones_data():
+                if event['event'] == 'start':
+                    self.total = event['data']['total']
+                    self._finish_stage('scrape')
+                    self._start_stage('score')
+                elif event['event'] == 'progress':
+                    self.processed = event['data']['processed']
+                elif event['event'] == 'complete':
+                    self._finish_stage('score')
+                    self._start_stage('commit')
+                    commit_smartphones_data(event['data'], event.get('ranking'))
+                    self.result = event['data']
+                    self._finish_stage('commit')
+                await self._publish(event)
+
+            self.status = 'completed'
+            logger.info(f"✅ Refresh job {self.job_id} completed")
+
+        except asyncio.CancelledError:
+            # Finish the job so waiters and later refreshes do not join a dead run
+            self._fail("Refresh job was cancelled")
+            raise
+
+        except Exception as e:
+            self._fail(e.detail if isinstance(e, HTTPException) else str(e))
+
+        finally:
+            self.finished_at = datetime.now()
+            async with self._changed:
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[Dict]:
+        """Replay events published so far, then follow the job until it finishes"""
+        position = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.events) > position or self.done)
+                pending = self.events[position:]
+                position = len(self.events)
+                finished = self.done
+
+            for event in pending:
+                yield event
+
+            if finished and position == len(self.events):
+                return
+
+    async def wait(self) -> List[SmartphoneData]:
+        """Wait for the job to finish and return its ranked results"""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.done)
+        if self.status == 'failed':
+            raise HTTPException(status_code=500, detail=self.error)
+        return self.result
+
+    def to_status(self) -> JobStatus:
+        duration = None
+        if self.started_at:
+            duration = round(((self.finished_at or datetime.now()) - self.started_at).total_seconds(), 3)
+        return JobStatus(
+            job_id=self.job_id,
+            status=self.status,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            duration_seconds=duration,
+            processed=self.processed,
+            total=self.total,
+            stages=list(self.stages.values()),
+            result_count=len(self.result) if self.result is not None else None,
+            error=self.error
+        )
+
+def start_refresh_job() -> Tuple[RefreshJob, bool]:
+    """Start a refresh job, or return the running one so refreshes never stack
+
+    Returns the job and whether it was newly created.
+    """
+    global current_refresh_job
+    if current_refresh_job is not None and not current_refresh_job.done:
+        return current_refresh_job, False
+
+    job = RefreshJob()
+    refresh_jobs[job.job_id] = job
+    current_refresh_job = job
+    job.task = asyncio.create_task(job.run())
+    return job, True
+
+def require_admin(token: Optional[str]):
+    """Reject requests without the configured admin token"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them")
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+async def profile_refresh_run(interval: float, trace_memory: bool, top: int) -> ProfileResponse:
+    """Run process_smartphones_data once under the CPU sampler and tracemalloc"""
+    profiler = SamplingProfiler(interval)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(10)
+
+    start_time = time.time()
+    profiler.start()
+    try:
+        smartphones_data = await process_smartphones_data()
+    finally:
+        profiler.stop()
+        snapshot = None
+        memory_peak = None
+        if started_tracing:
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ])
+            memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    top_allocations = []
+    if snapshot is not None:
+        for stat in snapshot.statistics('lineno')[:top]:
+            frame = stat.traceback[0]
+            top_allocations.append(ProfileAllocation(
+                location=f"{frame.filename}:{frame.lineno}",
+                size_kb=round(stat.size / 1024, 1),
+                count=stat.count
+            ))
+
+    return ProfileResponse(
+        duration_seconds=round(time.time() - start_time, 3),
+        interval_ms=interval * 1000,
+        samples=profiler.samples,
+        result_count=len(smartphones_data),
+        hot_functions=profiler.hot_functions(top),
+        collapsed_stacks=profiler.collapsed(),
+        memory_peak_kb=round(memory_peak / 1024, 1) if memory_peak is not None else None,
+        top_allocations=top_allocations
+    )
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application"""
-    initialize_sentiment_pipeline()
+    start_inference_queue()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the inference workers"""
+    if inference.inference_queue is not None:
+        inference.inference_queue.close()
 
 @app.get("/")
 async def root():
@@ -659,51 +462,90 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "top_mobiles": "/top-mobiles",
+            "ranking_formulas": "/rankings/formulas",
+            "top_mobiles_stream": "/top-mobiles/stream",
             "refresh": "/refresh",
+            "jobs": "/jobs/{job_id}",
+            "history": "/history/{asin}",
+            "product_reviews": "/products/{asin}/reviews",
+            "analyze": "/analyze",
+            "inference_metrics": "/inference/metrics",
             "docs": "/docs"
         }
     }
 
 @app.get("/top-mobiles", response_model=List[SmartphoneData])
-async def get_top_mobiles():
+async def get_top_mobiles(formula: str = Query(DEFAULT_SCORING_FORMULA, description="Scoring formula to rank by")):
     """Get top 5 sentiment-ranked smartphones"""
-    cache_key = "top_mobiles"
+    if formula not in SCORING_FORMULAS:
+        raise HTTPException(status_code=400, detail=f"Unknown scoring formula '{formula}'. "
+                                                    f"Available: {', '.join(SCORING_FORMULAS)}")
 
     # Check cache first
-    if cache_key in cache:
+    if TOP_MOBILES_CACHE_KEY in cache:
         logger.info("Returning cached data")
-        return cache[cache_key]
+        return rank_smartphones(cache[TOP_MOBILES_CACHE_KEY], formula)
 
     # Check persistent storage
     saved_data = load_smartphones_data()
     if saved_data:
         logger.info("Returning saved data from persistent storage")
-        cache[cache_key] = saved_data  # Also cache it
-        return saved_data
+        cache[TOP_MOBILES_CACHE_KEY] = saved_data  # Also cache it
+        return rank_smartphones(saved_data, formula)
 
     try:
-        # Process fresh data
+        # Process fresh data, joining a refresh that is already running
         logger.info("Processing fresh data...")
-        smartphones_data = await process_smartphones_data()
-
-        # Cache the results
-        cache[cache_key] = smartphones_data
-
-        # Save to persistent storage
-        save_smartphones_data(smartphones_data)
-
-        # Backup cache
-        save_cache_backup()
-
-        return smartphones_data
+        job, _ = start_refresh_job()
+        return rank_smartphones(await job.wait(), formula)
 
     except Exception as e:
         logger.error(f"Error in get_top_mobiles: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@app.get("/rankings/formulas", response_model=List[ScoringFormulaInfo])
+async def get_ranking_formulas():
+    """List the scoring formulas /top-mobiles can rank by"""
+    return [formula.to_info() for formula in SCORING_FORMULAS.values()]
+
+@app.get("/top-mobiles/stream")
+async def stream_top_mobiles():
+    """Stream ranking progress and each scored smartphone as Server-Sent Events"""
+    async def event_stream():
+        # Serve cached or saved rankings immediately
+        saved_data = cache.get(TOP_MOBILES_CACHE_KEY) or load_smartphones_data()
+        if saved_data:
+            cache[TOP_MOBILES_CACHE_KEY] = saved_data
+            yield format_sse('start', {'total': len(saved_data)})
+            for smartphone_data in saved_data:
+                yield format_sse('product', smartphone_data)
+            yield format_sse('complete', saved_data)
+            return
+
+        # Follow the running refresh job, starting one if needed
+        job, _ = start_refresh_job()
+        async for event in job.subscribe():
+            yield format_sse(event['event'], event['data'])
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/refresh", response_model=RefreshResponse)
-async def refresh_data(background_tasks: BackgroundTasks):
-    """Clear cache and refresh data"""
+async def refresh_data():
+    """Clear cache and start a tracked refresh job"""
+    if current_refresh_job is not None and not current_refresh_job.done:
+        job = current_refresh_job
+        logger.info(f"Refresh already in progress, joining job {job.job_id}")
+        return RefreshResponse(
+            detail="Refresh already in progress",
+            timestamp=datetime.now(),
+            job_id=job.job_id,
+            status_url=f"/jobs/{job.job_id}"
+        )
+
     cache.clear()
     logger.info("Cache cleared")
 
@@ -718,14 +560,110 @@ async def refresh_data(background_tasks: BackgroundTasks):
     except Exception as e:
         logger.warning(f"Error clearing persistent storage: {e}")
 
-    # Optionally trigger background refresh
-    background_tasks.add_task(process_smartphones_data)
+    job, _ = start_refresh_job()
 
     return RefreshResponse(
         detail="Cache and persistent storage cleared, refresh initiated",
-        timestamp=datetime.now()
+        timestamp=datetime.now(),
+        job_id=job.job_id,
+        status_url=f"/jobs/{job.job_id}"
+    )
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job_status(job_id: str):
+    """Get progress and stage timings of a refresh job"""
+    job = refresh_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_status()
+
+@app.post("/analyze", response_model=AnalyzeResponse)
+async def analyze_texts(request: AnalyzeRequest):
+    """Score arbitrary texts through the shared inference queue"""
+    if not sentiment_model_ready():
+        raise HTTPException(status_code=503, detail="Sentiment model is not loaded")
+
+    texts = [clean_text(text) for text in request.texts]
+    sentiment_data = await asyncio.to_thread(analyze_sentiment_batch, texts)
+    if 'scores' not in sentiment_data:
+        raise HTTPException(status_code=500, detail="Sentiment analysis failed")
+
+    return AnalyzeResponse(
+        results=[ReviewScore(text=text, score=round(score, 4), sentiment=sentiment_bucket(score))
+                 for text, score in zip(texts, sentiment_data['scores'])],
+        average_sentiment=round(sentiment_data['average_sentiment'], 4),
+        positive_ratio=round(sentiment_data['positive_ratio'], 4)
+    )
+
+@app.get("/inference/metrics")
+async def inference_metrics():
+    """Get inference queue depth, batch fill and latency metrics"""
+    if inference.inference_queue is None:
+        raise HTTPException(status_code=503, detail="Inference queue is not running")
+    return inference.inference_queue.metrics()
+
+@app.get("/products/{asin}/reviews", response_model=ReviewsPage)
+async def get_stored_product_reviews(asin: str, sentiment: Optional[str] = Query(None, pattern="^(positive|neutral|negative)$"),
+                              offset: int = Query(0, ge=0), limit: int = Query(20, ge=1, le=100)):
+    """Get stored reviews and their sentiment scores for a product"""
+    stored = await asyncio.to_thread(review_store.load, product_index.canonical_id(asin))
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"No stored reviews for {asin}")
+
+    reviews = stored['reviews']
+    if sentiment:
+        reviews = [review for review in reviews if review['sentiment'] == sentiment]
+
+    return ReviewsPage(
+        asin=asin,
+        name=stored.get('name'),
+        total=len(reviews),
+        offset=offset,
+        limit=limit,
+        counts=stored['counts'],
+        reviews=reviews[offset:offset + limit],
+        last_updated=datetime.fromisoformat(stored['timestamp'])
     )
 
+@app.get("/history/{asin}", response_model=HistoryResponse)
+async def get_history(asin: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                      limit: Optional[int] = Query(None, ge=1, le=10000)):
+    """Get the sentiment and rank history of a product"""
+    points = await asyncio.to_thread(history_store.query, product_index.canonical_id(asin), start, end, limit)
+    return HistoryResponse(asin=asin, points=points)
+
+@app.post("/admin/profile", response_model=ProfileResponse)
+async def profile_refresh(x_admin_token: Optional[str] = Header(None),
+                          interval_ms: float = Query(5, ge=1, le=100),
+                          memory: bool = Query(True, description="Trace allocations with tracemalloc"),
+                          top: int = Query(25, ge=1, le=200),
+                          output: str = Query("json", pattern="^(json|collapsed)$")):
+    """Profile one scrape-and-score run without committing its results
+
+    Cached rankings, stored results and history are left untouched; as in any
+    refresh, scraped reviews and newly seen product ids are still stored.
+    ``output=collapsed`` returns only the collapsed stacks as text, ready for
+    flamegraph.pl or speedscope.
+    """
+    global profiling_active
+    require_admin(x_admin_token)
+    if profiling_active:
+        raise HTTPException(status_code=409, detail="A profiling run is already in progress")
+    if current_refresh_job is not None and not current_refresh_job.done:
+        raise HTTPException(status_code=409, detail="A refresh is running; profile once it has finished")
+
+    profiling_active = True
+    try:
+        logger.info(f"Profiling a refresh run (interval {interval_ms}ms, memory tracing {memory})")
+        profile = await profile_refresh_run(interval_ms / 1000, memory, top)
+    finally:
+        profiling_active = False
+    logger.info(f"✅ Profiled refresh run in {profile.duration_seconds}s ({profile.samples} samples)")
+
+    if output == "collapsed":
+        return PlainTextResponse(profile.collapsed_stacks)
+    return profile
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -747,8 +685,13 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now(),
-        "model_loaded": sentiment_pipeline is not None,
+        "model_loaded": sentiment_model_ready(),
+        "scraper_backend": SCRAPER_BACKEND,
+        "sentiment_backend": SENTIMENT_BACKEND,
+        "inference": inference.inference_queue.metrics() if inference.inference_queue else None,
+        "review_filter": review_filter.metrics(),
         "cache_size": len(cache),
+        "refresh_job": current_refresh_job.to_status() if current_refresh_job else None,
         "storage": storage_status
     }
 
@@ -795,6 +738,12 @@ async def storage_status():
 
     return status
 
+# Load the model at import time so a preloading server (gunicorn --preload) forks
+# workers that already hold it, making worker recycling nearly free. Only applies
+# to in-process inference; worker pools load the model in their own processes.
+if os.environ.get("PRELOAD_MODEL") == "1" and INFERENCE_WORKERS <= 0:
+    initialize_sentiment_pipeline()
+
 if __name__ == "__main__":
     uvicorn.run(
         "app:app",
@@ -0,0 +1,292 @@
+"""
+Bulk offline sentiment scoring of review dumps
+
+Streams a JSONL or CSV review dump in fixed-size chunks, scores them across
+worker processes with the same cleaning, model and composite score as the API,
+and appends scored rows to a JSONL output. Each output row carries the input
+row's fields and its index in the input; rows without review text are written
+with a SKIPPED label so every input row is accounted for. Progress is
+checkpointed after every chunk so an interrupted run can be resumed with
+--resume.
+
+Usage:
+    python score_reviews.py reviews.jsonl scored.jsonl --summary products.json
+    python score_reviews.py reviews.csv scored.jsonl --text-field review_text --resume
+"""
+
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sentiment.inference import analyze_sentiment_batch, initialize_sentiment_pipeline
+from sentiment.scoring import calculate_composite_score
+from sentiment.text import clean_text
+
+logger = logging.getLogger("score_reviews")
+
+def read_rows(path: Path, input_format: str) -> Iterator[Dict]:
+    """Stream rows from a JSONL or CSV file without loading it into memory"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if input_format == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+def iter_chunks(rows: Iterator[Dict], chunk_size: int, skip: int = 0) -> Iterator[Tuple[int, List[Dict]]]:
+    """Group rows into (index of the first row, rows) chunks, skipping rows committed by a previous run"""
+    chunk, start = [], skip
+    for index, row in enumerate(rows):
+        if index < skip:
+            continue
+        if not chunk:
+            start = index
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield start, chunk
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+def init_worker(threads_per_worker: int):
+    """Load the model once per worker process with a pinned thread count"""
+    try:
+        import torch
+        torch.set_num_threads(threads_per_worker)
+    except ImportError:
+        pass
+    initialize_sentiment_pipeline()
+
+def score_texts(texts: List[str]) -> List[float]:
+    """Score a chunk of cleaned review texts, returning POSITIVE probabilities"""
+    if not texts:
+        return []
+    result = analyze_sentiment_batch(texts)
+    if 'scores' not in result:
+        raise RuntimeError("Sentiment analysis failed for chunk")
+    return result['scores']
+
+class Checkpoint:
+    """Resumable progress of a scoring run
+
+    Stores how many input rows have been committed, the byte length of the
+    output at that point and the running per-product aggregates. Aggregates
+    are appended to a side log as the products changed by each chunk, so a
+    save costs the size of the chunk rather than of every product seen.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.products_path = path.with_suffix(path.suffix + '.products')
+        self.rows_done = 0
+        self.output_offset = 0
+        self.products_offset = 0
+        self.products: Dict[str, Dict] = {}
+        self._changed = set()
+
+    def load(self) -> bool:
+        if not self.path.exists():
+            return False
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.rows_done = state['rows_done']
+        self.output_offset = state['output_offset']
+        self.products_offset = state.get('products_offset', 0)
+        if 'products' in state:
+            # Checkpoint written before the side log; carry its aggregates over on the next save
+            self.products = state['products']
+            self._changed = set(self.products)
+
+        # Replay the aggregates committed with the checkpoint; later entries supersede earlier ones
+        if self.products_offset:
+            with open(self.products_path, 'rb') as f:
+                for line in f.read(self.products_offset).splitlines():
+                    self.products.update(json.loads(line))
+        return True
+
+    def save(self):
+        # Entries past the committed offset belong to a chunk that was never checkpointed
+        with open(self.products_path, 'ab') as f:
+            f.truncate(self.products_offset)
+            if self._changed:
+                f.write((json.dumps({product: self.products[product] for product in self._changed},
+                                    ensure_ascii=False) + '\n').encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            self.products_offset = f.tell()
+        self._changed.clear()
+
+        temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'rows_done': self.rows_done,
+                'output_offset': self.output_offset,
+                'products_offset': self.products_offset,
+                'timestamp': time.time()
+            }, f)
+        os.replace(temp_path, self.path)
+
+    def update(self, product: str, rank: Optional[int], score: float):
+        stats = self.products.setdefault(product, {'rank': rank, 'count': 0, 'score_sum': 0.0, 'positive': 0})
+        stats['count'] += 1
+        stats['score_sum'] += score
+        if score > 0.5:
+            stats['positive'] += 1
+        if rank is not None and (stats['rank'] is None or rank < stats['rank']):
+            stats['rank'] = rank
+        self._changed.add(product)
+
+def prepare_chunk(start: int, chunk: List[Dict], args) -> Tuple[List[Tuple[int, Dict, str]], List[str]]:
+    """Clean review texts, returning (input index, row, text) for every row and the texts worth scoring
+
+    Rows without review text keep an empty text and are not scored.
+    """
+    entries, texts = [], []
+    for index, row in enumerate(chunk, start):
+        text = clean_text(str(row.get(args.text_field) or ''))
+        entries.append((index, row, text))
+        if text:
+            texts.append(text)
+    return entries, texts
+
+def parse_rank(value) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+def write_scored(out, checkpoint: Checkpoint, entries: List[Tuple[int, Dict, str]], scores: List[float], args):
+    """Append a chunk's rows to the output and advance the checkpoint
+
+    Each row keeps the input fields and gains its input index as `row`; rows
+    without review text get a null score and the SKIPPED label.
+    """
+    remaining_scores = iter(scores)
+    for index, row, text in entries:
+        product = str(row.get(args.product_field) or 'unknown')
+        scored = dict(row, row=index, product=product, text=text, sentiment_score=None, label='SKIPPED')
+        if text:
+            score = next(remaining_scores)
+            rank = parse_rank(row.get(args.rank_field)) if args.rank_field else None
+            checkpoint.update(product, rank, score)
+            scored.update(sentiment_score=round(score, 4), label='POSITIVE' if score > 0.5 else 'NEGATIVE')
+        out.write((json.dumps(scored, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    out.flush()
+    os.fsync(out.fileno())
+    checkpoint.rows_done += len(entries)
+    checkpoint.output_offset = out.tell()
+    checkpoint.save()
+
+def build_summary(checkpoint: Checkpoint) -> List[Dict]:
+    """Aggregate per-product sentiment and composite scores"""
+    summary = []
+    for product, stats in checkpoint.products.items():
+        positive_ratio = stats['positive'] / stats['count']
+        summary.append({
+            'product': product,
+            'rank': stats['rank'],
+            'review_count': stats['count'],
+            'average_sentiment': round(stats['score_sum'] / stats['count'], 4),
+            'positive_ratio': round(positive_ratio, 4),
+            'composite_score': calculate_composite_score(stats['rank'] or 0, positive_ratio)
+        })
+    summary.sort(key=lambda x: x['composite_score'], reverse=True)
+    return summary
+
+def run(args) -> int:
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+    input_format = args.format or ('csv' if input_path.suffix.lower() == '.csv' else 'jsonl')
+    checkpoint = Checkpoint(Path(args.checkpoint or f"{output_path}.checkpoint"))
+
+    if args.resume:
+        # Resuming from an empty checkpoint would truncate the previous run's output
+        if not checkpoint.load():
+            logger.error(f"❌ No checkpoint found at {checkpoint.path}; run without --resume to start over")
+            return 1
+        logger.info(f"Resuming after {checkpoint.rows_done} rows")
+    else:
+        checkpoint.save()
+
+    workers = args.workers if args.workers is not None else os.cpu_count() or 1
+    threads_per_worker = max(1, (os.cpu_count() or 1) // max(1, workers))
+    chunks = iter_chunks(read_rows(input_path, input_format), args.chunk_size, skip=checkpoint.rows_done)
+
+    started = time.time()
+    rows_at_start = checkpoint.rows_done
+
+    with open(output_path, 'ab' if args.resume else 'wb') as out:
+        # Discard rows written after the last checkpoint
+        out.truncate(checkpoint.output_offset)
+        out.seek(checkpoint.output_offset)
+
+        if workers <= 1:
+            init_worker(threads_per_worker)
+            for start, chunk in chunks:
+                entries, texts = prepare_chunk(start, chunk, args)
+                write_scored(out, checkpoint, entries, score_texts(texts), args)
+                logger.info(f"Scored {checkpoint.rows_done} rows")
+        else:
+            context = multiprocessing.get_context(args.start_method)
+            with context.Pool(workers, initializer=init_worker, initargs=(threads_per_worker,)) as pool:
+                # Bound the chunks in flight so memory stays flat regardless of input size
+                pending = deque()
+                max_pending = workers * 2
+
+                def drain_one():
+                    entries, result = pending.popleft()
+                    write_scored(out, checkpoint, entries, result.get(), args)
+                    logger.info(f"Scored {checkpoint.rows_done} rows")
+
+                for start, chunk in chunks:
+                    entries, texts = prepare_chunk(start, chunk, args)
+                    pending.append((entries, pool.apply_async(score_texts, (texts,))))
+                    if len(pending) >= max_pending:
+                        drain_one()
+                while pending:
+                    drain_one()
+
+    elapsed = time.time() - started
+    scored_rows = checkpoint.rows_done - rows_at_start
+    logger.info(f"✅ Scored {scored_rows} rows in {elapsed:.1f}s ({scored_rows / elapsed if elapsed else 0:.1f} rows/s)")
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(build_summary(checkpoint), f, indent=2, ensure_ascii=False)
+        logger.info(f"✅ Wrote product summary to {args.summary}")
+
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score a review dump offline with the sentiment model")
+    parser.add_argument("input", help="JSONL or CSV file of reviews")
+    parser.add_argument("output", help="JSONL file to append scored reviews to")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from file extension)")
+    parser.add_argument("--text-field", default="text", help="Field holding the review text")
+    parser.add_argument("--product-field", default="asin", help="Field identifying the product")
+    parser.add_argument("--rank-field", help="Field holding the bestseller rank, used for composite scores")
+    parser.add_argument("--summary", help="Write per-product aggregates and composite scores to this JSON file")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Reviews per inference chunk")
+    parser.add_argument("--workers", type=int, help="Inference processes (default: CPU count, 1 = in-process)")
+    parser.add_argument("--start-method", default="spawn", choices=["spawn", "fork", "forkserver"],
+                        help="Multiprocessing start method")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--resume", action="store_true", help="Resume from the checkpoint of a previous run")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
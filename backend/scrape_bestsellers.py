@@ -0,0 +1,76 @@
+"""
+Scrape bestseller listings and reviews without loading the API or the model
+
+Writes one JSONL row per review (asin, product_id, rank, name, text), which
+score_reviews.py can score offline, and optionally the listings themselves.
+
+Usage:
+    python scrape_bestsellers.py reviews.jsonl --limit 20 --max-reviews 50
+    python score_reviews.py reviews.jsonl scored.jsonl --product-field product_id --rank-field rank
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import List, Optional
+
+from sentiment.scraper import create_scraper
+
+logger = logging.getLogger("scrape_bestsellers")
+
+def run(args) -> int:
+    scraper = create_scraper()
+    products = scraper.get_bestseller_smartphones(limit=args.limit)
+    if not products:
+        logger.error("❌ No bestseller listings found")
+        return 1
+
+    if args.listings:
+        with open(args.listings, 'w', encoding='utf-8') as f:
+            for product in products:
+                f.write(json.dumps({
+                    'asin': product.asin,
+                    'product_id': product.product_id,
+                    'rank': product.rank,
+                    'name': product.name,
+                    'link': product.link,
+                    'price': product.price,
+                    'rating': product.rating
+                }, ensure_ascii=False) + '\n')
+        logger.info(f"✅ Wrote {len(products)} listings to {args.listings}")
+
+    review_count = 0
+    with open(args.output, 'w', encoding='utf-8') as out:
+        for i, product in enumerate(products):
+            if i and scraper.request_delay:
+                time.sleep(scraper.request_delay)
+            reviews = scraper.get_product_reviews(product.asin, max_reviews=args.max_reviews)
+            for text in reviews:
+                out.write(json.dumps({
+                    'asin': product.asin,
+                    'product_id': product.product_id,
+                    'rank': product.rank,
+                    'name': product.name,
+                    'text': text
+                }, ensure_ascii=False) + '\n')
+            review_count += len(reviews)
+            logger.info(f"Scraped {len(reviews)} reviews for {product.name[:50]}")
+
+    logger.info(f"✅ Wrote {review_count} reviews for {len(products)} products to {args.output}")
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scrape bestseller smartphones and their reviews to JSONL")
+    parser.add_argument("output", help="JSONL file to write review rows to")
+    parser.add_argument("--listings", help="Also write the bestseller listings to this JSONL file")
+    parser.add_argument("--limit", type=int, default=20, help="Bestseller listings to scrape")
+    parser.add_argument("--max-reviews", type=int, default=50, help="Reviews to scrape per product")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
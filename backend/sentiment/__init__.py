@@ -0,0 +1,8 @@
+"""
+Scraping, scoring and storage for the sentiment-ranked smartphones service
+
+Modules are split by entry point so each loads only what it needs:
+``scraper`` for fetching listings and reviews, ``inference`` and ``scoring``
+for sentiment, and ``storage``/``history`` for persistence. Heavy dependencies
+(requests, BeautifulSoup, numpy, transformers) are imported where they are used.
+"""
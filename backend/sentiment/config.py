@@ -0,0 +1,41 @@
+"""
+Paths and environment configuration shared by every entry point
+"""
+
+import os
+from pathlib import Path
+
+# Data storage configuration
+DATA_DIR = Path("../data")
+SMARTPHONES_FILE = DATA_DIR / "smartphones_data.json"
+CACHE_FILE = DATA_DIR / "cache_backup.json"
+HISTORY_DIR = DATA_DIR / "history"
+REVIEWS_DIR = DATA_DIR / "reviews"
+PRODUCT_INDEX_FILE = DATA_DIR / "product_index.json"
+AMAZON_BASE_URL = "https://www.amazon.in"
+
+# Admin configuration
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")  # Admin endpoints are disabled when unset
+
+# Scraper configuration
+SCRAPER_BACKEND = os.environ.get("SCRAPER_BACKEND", "amazon")  # "stub" serves generated listings offline
+STUB_SCRAPER_DELAY = float(os.environ.get("STUB_SCRAPER_DELAY", "0.1"))  # Simulated seconds per page fetch
+
+# Model configuration
+SENTIMENT_BACKEND = os.environ.get("SENTIMENT_BACKEND", "model")  # "stub" scores with a keyword lexicon offline
+MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+# Optional model for reviews the language filter routes away from the English model;
+# when unset, non-English reviews are skipped
+MULTILINGUAL_MODEL_NAME = os.environ.get("MULTILINGUAL_MODEL_NAME", "")
+MODEL_CACHE_DIR = Path(os.environ.get("MODEL_CACHE_DIR", DATA_DIR / "model_cache"))
+MODEL_ARTIFACT_FILES = ("config.json", "model.safetensors", "tokenizer.json")
+MODEL_MAX_LENGTH = 512
+
+# Inference worker pool configuration (0 workers = run the model in-process)
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", "1"))
+INFERENCE_THREADS = int(os.environ.get("INFERENCE_THREADS", "0")) or max(1, (os.cpu_count() or 1) // max(1, INFERENCE_WORKERS))
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get("INFERENCE_MAX_BATCH_SIZE", "32"))
+INFERENCE_BATCH_WINDOW_MS = float(os.environ.get("INFERENCE_BATCH_WINDOW_MS", "5"))
+INFERENCE_LATENCY_SLO_MS = float(os.environ.get("INFERENCE_LATENCY_SLO_MS", "500"))
+INFERENCE_TIMEOUT = 120  # Seconds a caller waits for its scores
+INFERENCE_WORKER_START_TIMEOUT = 300  # Seconds a worker may take to load the model
@@ -0,0 +1,126 @@
+"""
+Columnar store of ranking snapshots
+"""
+
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .config import HISTORY_DIR
+from .identity import extract_asin
+from .schemas import HistoryPoint, SmartphoneData
+
+logger = logging.getLogger(__name__)
+
+class SentimentHistoryStore:
+    """Append-only columnar store of ranking snapshots
+
+    Each column lives in its own raw NumPy file under ``HISTORY_DIR`` and rows
+    are appended per snapshot. Queries memory-map the columns and scan the
+    ASIN and timestamp columns in chunks, so only matching rows are copied
+    into memory.
+    """
+
+    COLUMNS = {
+        'asin': 'S16',
+        'timestamp': '<f8',  # Unix epoch seconds
+        'rank': '<i2',
+        'composite_score': '<f4',
+        'positive_ratio': '<f4',
+        'average_sentiment': '<f4',
+        'review_count': '<i4',  # -1 when unknown
+        'rating': '<f4'  # NaN when unknown
+    }
+    SCAN_CHUNK_ROWS = 1 << 20
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _column_path(self, column: str) -> Path:
+        return self.directory / f"{column}.bin"
+
+    def __len__(self) -> int:
+        # The shortest column bounds the committed rows if an append was interrupted
+        lengths = []
+        for column, dtype in self.COLUMNS.items():
+            path = self._column_path(column)
+            lengths.append(path.stat().st_size // np.dtype(dtype).itemsize if path.exists() else 0)
+        return min(lengths)
+
+    def append_snapshot(self, smartphones: List[SmartphoneData], timestamp: Optional[datetime] = None):
+        """Append one ranking snapshot, one row per ranked smartphone"""
+        rows = [(asin, rank, phone) for rank, phone in enumerate(smartphones, 1)
+                if (asin := phone.product_id or extract_asin(phone.link))]
+        if not rows:
+            return
+
+        epoch = (timestamp or datetime.now()).timestamp()
+        values = {
+            'asin': [asin.encode('ascii', 'ignore') for asin, _, _ in rows],
+            'timestamp': [epoch] * len(rows),
+            'rank': [rank for _, rank, _ in rows],
+            'composite_score': [phone.composite_score for _, _, phone in rows],
+            'positive_ratio': [phone.positive_ratio for _, _, phone in rows],
+            'average_sentiment': [phone.average_sentiment for _, _, phone in rows],
+            'review_count': [phone.review_count if phone.review_count is not None else -1 for _, _, phone in rows],
+            'rating': [phone.rating if phone.rating is not None else np.nan for _, _, phone in rows]
+        }
+
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            committed = len(self)
+            for column, dtype in self.COLUMNS.items():
+                path = self._column_path(column)
+                itemsize = np.dtype(dtype).itemsize
+                with open(path, 'ab') as f:
+                    # Drop any partial tail left by an interrupted append
+                    f.truncate(committed * itemsize)
+                    f.write(np.asarray(values[column], dtype=dtype).tobytes())
+
+        logger.info(f"✅ Appended {len(rows)} rows to sentiment history")
+
+    def query(self, asin: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              limit: Optional[int] = None) -> List[HistoryPoint]:
+        """Return the snapshots of one ASIN within [start, end], oldest first"""
+        total = len(self)
+        if not total:
+            return []
+
+        columns = {column: np.memmap(self._column_path(column), dtype=dtype, mode='r', shape=(total,))
+                   for column, dtype in self.COLUMNS.items()}
+        key = np.array(asin.encode('ascii', 'ignore'), dtype=self.COLUMNS['asin'])
+        start_epoch = start.timestamp() if start else -np.inf
+        end_epoch = end.timestamp() if end else np.inf
+
+        matches = []
+        for offset in range(0, total, self.SCAN_CHUNK_ROWS):
+            stop = min(offset + self.SCAN_CHUNK_ROWS, total)
+            timestamps = columns['timestamp'][offset:stop]
+            mask = (columns['asin'][offset:stop] == key) & (timestamps >= start_epoch) & (timestamps <= end_epoch)
+            matches.append(np.flatnonzero(mask) + offset)
+
+        indices = np.concatenate(matches)
+        if limit is not None:
+            indices = indices[-limit:]  # Most recent points
+
+        points = []
+        for i in indices:
+            review_count = int(columns['review_count'][i])
+            rating = float(columns['rating'][i])
+            points.append(HistoryPoint(
+                timestamp=datetime.fromtimestamp(float(columns['timestamp'][i])),
+                rank=int(columns['rank'][i]),
+                composite_score=round(float(columns['composite_score'][i]), 4),
+                positive_ratio=round(float(columns['positive_ratio'][i]), 4),
+                average_sentiment=round(float(columns['average_sentiment'][i]), 4),
+                review_count=review_count if review_count >= 0 else None,
+                rating=None if np.isnan(rating) else round(rating, 2)
+            ))
+        return points
+
+history_store = SentimentHistoryStore(HISTORY_DIR)
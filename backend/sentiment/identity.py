@@ -0,0 +1,183 @@
+"""
+Canonical product identity: ASIN extraction, URL normalization and variant grouping
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import AMAZON_BASE_URL, PRODUCT_INDEX_FILE
+
+logger = logging.getLogger(__name__)
+
+_ASIN_IN_URL = re.compile(r'/(?:dp|gp/product|gp/aw/d|product-reviews)/([A-Za-z0-9]{10})(?=[/?#]|$)')
+_TITLE_BRACKETS = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_TITLE_SEPARATOR = re.compile(r'\s*[|,]|\s+[-–]\s+')
+_TITLE_STORAGE = re.compile(r'\b\d+\s*(?:gb|tb)\b(?:\s*(?:ram|rom|storage))?')
+_TITLE_MODEL_IN_BRACKETS = re.compile(r'[a-z]*\d+[a-z]*')  # e.g. Nothing Phone (2a)
+_TITLE_CONDITION = re.compile(r'\b(?:renewed|refurbished)\b')
+_NETWORK_WORDS = frozenset({'2g', '3g', '4g', '5g', 'lte', 'volte'})
+
+# Bump when product_model_key changes, so persisted groupings are rebuilt
+MODEL_KEY_VERSION = 2
+
+def extract_asin(product_link: str) -> Optional[str]:
+    """Extract the product id (ASIN) from an Amazon product link"""
+    if not product_link:
+        return None
+    match = _ASIN_IN_URL.search(product_link)
+    return match.group(1).upper() if match else None
+
+def canonical_product_url(asin: str) -> str:
+    """Stable product URL without tracking segments or query parameters"""
+    return f"{AMAZON_BASE_URL}/dp/{asin}"
+
+def _keep_model_in_brackets(match: re.Match) -> str:
+    content = match.group(0)[1:-1].strip()
+    if _TITLE_MODEL_IN_BRACKETS.fullmatch(content) and not _TITLE_STORAGE.fullmatch(content):
+        return f' {content} '
+    return ' '
+
+def product_model_key(name: str) -> str:
+    """Reduce a listing title to its model, e.g. 'Apple iPhone 15 (128 GB) - Black' -> 'apple iphone 15'
+
+    Title parts are taken up to the first one naming a model number, so
+    'Samsung | Galaxy M14 5G' keeps the model. Bracketed model numbers such as
+    'Nothing Phone (2a)' are kept, while network words like '5G' never count
+    as the model number. Titles without a model number return '' and are
+    never grouped, rather than grouping on the brand alone. Renewed and
+    refurbished listings get their own key.
+    """
+    title = name.lower()
+    words: List[str] = []
+    for part in _TITLE_SEPARATOR.split(_TITLE_BRACKETS.sub(_keep_model_in_brackets, title)):
+        words += re.findall(r'[a-z0-9]+', _TITLE_STORAGE.sub(' ', part))
+        if any(char.isdigit() for word in words if word not in _NETWORK_WORDS for char in word):
+            return ' '.join(words) + (' renewed' if _TITLE_CONDITION.search(title) else '')
+    return ''
+
+class ProductIdentityIndex:
+    """Persistent mapping of ASINs to canonical products
+
+    The first ASIN seen for a model becomes its canonical product id. Variant
+    ASINs (other colours or storage sizes) resolve to it, so the review store,
+    history and rankings key on one id across URLs and refreshes. The index is
+    only rewritten when a new ASIN is registered, or when it was grouped with
+    an older MODEL_KEY_VERSION and is regrouped on load.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._asins: Dict[str, str] = {}
+        self._models: Dict[str, str] = {}
+        self._products: Dict[str, Dict] = {}
+        self._names: Dict[str, Optional[str]] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._products)
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self._asins = state['asins']
+            self._models = state['models']
+            self._products = state['products']
+            self._names = state.get('names', {})
+            logger.info(f"✅ Loaded product index with {len(self._products)} products from {self.path}")
+        except Exception as e:
+            logger.error(f"❌ Error loading product index: {e}")
+            return
+
+        if state.get('version') != MODEL_KEY_VERSION:
+            moved = self._regroup()
+            logger.info(f"Regrouped product index for model key version {MODEL_KEY_VERSION}, {moved} ASINs moved")
+            self._save()
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MODEL_KEY_VERSION, 'asins': self._asins, 'models': self._models,
+                           'products': self._products, 'names': self._names}, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.error(f"❌ Error saving product index: {e}")
+
+    def _register(self, asin: str, name: Optional[str]) -> str:
+        model_key = product_model_key(name) if name else ''
+        product_id = self._models.get(model_key, asin) if model_key else asin
+        self._asins[asin] = product_id
+        self._names[asin] = name
+        if model_key:
+            self._models.setdefault(model_key, product_id)
+        product = self._products.setdefault(product_id, {'name': name, 'model': model_key, 'variants': []})
+        product['variants'].append(asin)
+        if product_id != asin:
+            logger.info(f"Grouped {asin} as a variant of {product_id} ({model_key})")
+        return product_id
+
+    def _regroup(self) -> int:
+        """Rebuild the groups from the title each ASIN was registered with, returning how many ASINs moved"""
+        previous = self._asins
+        names = dict(self._names)
+        for product_id, product in self._products.items():
+            names.setdefault(product_id, product['name'])  # Older indexes kept only the canonical ASIN's title
+
+        self._asins, self._models, self._products, self._names = {}, {}, {}, {}
+        moved = 0
+        for asin, product_id in previous.items():
+            if asin not in names:
+                # A variant without its title is dropped and registered again when next seen
+                moved += 1
+            elif self._register(asin, names[asin]) != product_id:
+                moved += 1
+        return moved
+
+    def resolve(self, asin: str, name: Optional[str] = None) -> str:
+        """Return the canonical product id of an ASIN, registering it on first sight"""
+        with self._lock:
+            self._load()
+            product_id = self._asins.get(asin)
+            if product_id is not None:
+                return product_id
+
+            product_id = self._register(asin, name)
+            self._save()
+            return product_id
+
+    def regroup(self) -> int:
+        """Regroup every registered ASIN with the current model key, returning how many moved"""
+        with self._lock:
+            self._load()
+            moved = self._regroup()
+            self._save()
+            return moved
+
+    def canonical_id(self, asin: str) -> str:
+        """Map any known ASIN to its canonical product id"""
+        with self._lock:
+            self._load()
+            return self._asins.get(asin.upper(), asin)
+
+    def variants(self, product_id: str) -> List[str]:
+        with self._lock:
+            self._load()
+            product = self._products.get(product_id)
+            return list(product['variants']) if product else []
+
+product_index = ProductIdentityIndex(PRODUCT_INDEX_FILE)
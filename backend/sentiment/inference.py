@@ -0,0 +1,641 @@
+"""
+Sentiment model loading and batched inference, in-process or in worker processes
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import (
+    INFERENCE_BATCH_WINDOW_MS, INFERENCE_LATENCY_SLO_MS, INFERENCE_MAX_BATCH_SIZE, INFERENCE_THREADS,
+    INFERENCE_TIMEOUT, INFERENCE_WORKER_START_TIMEOUT, INFERENCE_WORKERS, MODEL_ARTIFACT_FILES, MODEL_CACHE_DIR, MODEL_MAX_LENGTH, MODEL_NAME,
+    MULTILINGUAL_MODEL_NAME, SENTIMENT_BACKEND
+)
+
+logger = logging.getLogger(__name__)
+
+sentiment_pipeline = None
+multilingual_pipeline = None
+inference_queue = None
+
+# Initialize sentiment analysis pipeline
+def ensure_model_artifacts(model_name: str = MODEL_NAME) -> Path:
+    """Materialize the model as local safetensors artifacts, downloading only once
+
+    The artifact directory holds the weights as ``model.safetensors`` and the
+    pre-built fast tokenizer as ``tokenizer.json``, so later loads skip the hub,
+    weight conversion and tokenizer construction.
+    """
+    artifact_dir = MODEL_CACHE_DIR / model_name.replace('/', '--')
+    if all((artifact_dir / name).exists() for name in MODEL_ARTIFACT_FILES):
+        return artifact_dir
+
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    logger.info(f"Building model artifacts in {artifact_dir}...")
+    artifact_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging_dir = artifact_dir.with_name(f"{artifact_dir.name}.tmp-{os.getpid()}")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+    AutoTokenizer.from_pretrained(model_name, use_fast=True).save_pretrained(staging_dir)
+    AutoModelForSequenceClassification.from_pretrained(model_name).save_pretrained(staging_dir, safe_serialization=True)
+
+    # Publish atomically. If another process won the race, keep its directory (it may
+    # already be loading from it) and discard ours; only replace an incomplete one
+    try:
+        if artifact_dir.exists() and not all((artifact_dir / name).exists() for name in MODEL_ARTIFACT_FILES):
+            shutil.rmtree(artifact_dir, ignore_errors=True)
+        staging_dir.rename(artifact_dir)
+    except OSError:
+        pass
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+    logger.info(f"✅ Model artifacts saved to {artifact_dir}")
+    return artifact_dir
+
+def _load_sequence_classifier(artifact_dir: Path):
+    """Load the model weights from the local safetensors artifacts"""
+    from transformers import AutoModelForSequenceClassification
+
+    model = AutoModelForSequenceClassification.from_pretrained(
+        artifact_dir,
+        local_files_only=True,
+        use_safetensors=True,
+        low_cpu_mem_usage=True
+    )
+    model.eval()
+    return model
+
+class StubSentimentPipeline:
+    """Deterministic keyword scorer standing in for the model, for offline load tests
+
+    Returns pipeline-shaped results: a POSITIVE probability of
+    (positive words + 1) / (sentiment words + 2).
+    """
+
+    POSITIVE_WORDS = {'good', 'great', 'excellent', 'amazing', 'love', 'smooth', 'fast', 'bright', 'sharp',
+                      'recommend', 'satisfied', 'best', 'value', 'worth', 'superb', 'awesome'}
+    NEGATIVE_WORDS = {'bad', 'poor', 'slow', 'cheap', 'heats', 'drains', 'weak', 'harsh', 'tinny', 'ads',
+                      'lag', 'worst', 'waste', 'broken', 'defective', 'disappointed'}
+    _WORD = re.compile(r"[a-z']+")
+
+    def __call__(self, texts: List[str], **kwargs) -> List[List[Dict]]:
+        results = []
+        for text in texts:
+            words = self._WORD.findall(text.lower())
+            positive = sum(1 for word in words if word in self.POSITIVE_WORDS)
+            negative = sum(1 for word in words if word in self.NEGATIVE_WORDS)
+            score = (positive + 1) / (positive + negative + 2)
+            results.append([{'label': 'NEGATIVE', 'score': 1 - score}, {'label': 'POSITIVE', 'score': score}])
+        return results
+
+def initialize_sentiment_pipeline():
+    """Initialize the sentiment analysis pipeline from the local model artifacts"""
+    global sentiment_pipeline
+    if sentiment_pipeline is None and SENTIMENT_BACKEND == "stub":
+        logger.info("Using the stub sentiment scorer (SENTIMENT_BACKEND=stub)")
+        sentiment_pipeline = StubSentimentPipeline()
+    if sentiment_pipeline is None:
+        logger.info("Loading sentiment analysis model...")
+        start_time = time.time()
+        try:
+            artifact_dir = ensure_model_artifacts()
+
+            from transformers import AutoTokenizer, pipeline  # Import here for lazy loading
+
+            tokenizer = AutoTokenizer.from_pretrained(artifact_dir, local_files_only=True)
+            # Loading copies the weights into this process; only workers forked after a
+            # preload (PRELOAD_MODEL=1) share them, copy-on-write
+            model = _load_sequence_classifier(artifact_dir)
+
+            sentiment_pipeline = pipeline(
+                "sentiment-analysis",
+                model=model,
+                tokenizer=tokenizer,
+                return_all_scores=True
+            )
+            logger.info(f"✅ Sentiment analysis model loaded successfully in {time.time() - start_time:.2f}s")
+        except Exception as e:
+            logger.error(f"❌ Failed to load sentiment model: {e}")
+            raise
+
+_multilingual_lock = threading.Lock()
+
+def initialize_multilingual_pipeline():
+    """Load the model for routed non-English reviews on first use"""
+    global multilingual_pipeline
+    with _multilingual_lock:
+        if multilingual_pipeline is None:
+            logger.info(f"Loading multilingual sentiment model {MULTILINGUAL_MODEL_NAME}...")
+            artifact_dir = ensure_model_artifacts(MULTILINGUAL_MODEL_NAME)
+
+            from transformers import AutoTokenizer, pipeline
+
+            multilingual_pipeline = pipeline(
+                "sentiment-analysis",
+                model=_load_sequence_classifier(artifact_dir),
+                tokenizer=AutoTokenizer.from_pretrained(artifact_dir, local_files_only=True),
+                return_all_scores=True
+            )
+            logger.info("✅ Multilingual sentiment model loaded")
+
+class _SharedBatchSlot:
+    """Token-ID, attention-mask and score arrays of one worker in shared memory"""
+
+    def __init__(self, max_batch_size: int, max_length: int, name: Optional[str] = None):
+        import numpy as np
+
+        ids_bytes = max_batch_size * max_length * np.dtype(np.int64).itemsize
+        size = 2 * ids_bytes + max_batch_size * np.dtype(np.float32).itemsize
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.input_ids = np.ndarray((max_batch_size, max_length), dtype=np.int64, buffer=self.shm.buf)
+        self.attention_mask = np.ndarray((max_batch_size, max_length), dtype=np.int64, buffer=self.shm.buf, offset=ids_bytes)
+        self.scores = np.ndarray((max_batch_size,), dtype=np.float32, buffer=self.shm.buf, offset=2 * ids_bytes)
+
+    def close(self, unlink: bool = False):
+        # Drop the array views before closing the buffer they point into
+        del self.input_ids, self.attention_mask, self.scores
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def _inference_worker_main(worker_index: int, slot_name: str, max_batch_size: int, max_length: int,
+                           threads: int, artifact_dir: str, requests_queue, results_queue):
+    """Inference process: score batches placed in its shared-memory slot"""
+    import torch
+
+    try:
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+        model = _load_sequence_classifier(Path(artifact_dir))
+        positive_index = model.config.label2id.get('POSITIVE', 1)
+        slot = _SharedBatchSlot(max_batch_size, max_length, name=slot_name)
+    except Exception as e:
+        results_queue.put(f"Inference worker {worker_index} failed to start: {e}")
+        return
+    results_queue.put(None)  # Ready
+
+    try:
+        while True:
+            message = requests_queue.get()
+            if message is None:
+                break
+            batch_size, seq_len = message
+            try:
+                with torch.inference_mode():
+                    logits = model(
+                        input_ids=torch.from_numpy(slot.input_ids[:batch_size, :seq_len]),
+                        attention_mask=torch.from_numpy(slot.attention_mask[:batch_size, :seq_len])
+                    ).logits
+                    slot.scores[:batch_size] = torch.softmax(logits, dim=-1)[:, positive_index].numpy()
+                results_queue.put(None)
+            except Exception as e:
+                results_queue.put(str(e))
+    finally:
+        slot.close()
+
+class _InferenceRequest:
+    __slots__ = ('scores', 'remaining', 'error', 'done', 'submitted_at')
+
+    def __init__(self, size: int):
+        self.scores = [0.0] * size
+        self.remaining = size
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+        self.submitted_at = time.perf_counter()
+
+class InferenceQueue:
+    """Dynamic micro-batching queue in front of the sentiment model
+
+    Callers on any thread submit texts with ``score``. Each lane thread takes
+    the oldest queued text, waits up to ``batch_window_ms`` for more to arrive
+    (or until ``max_batch_size`` is reached) and scores them as one batch, so
+    concurrent refreshes, CLI jobs and ``/analyze`` calls share model passes.
+    Subclasses implement ``_run_batch`` for one lane.
+    """
+
+    def __init__(self, lanes: int, max_batch_size: int = 32, batch_window_ms: float = 5.0,
+                 latency_slo_ms: float = 500.0):
+        self.lanes = lanes
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000
+        self.latency_slo_ms = latency_slo_ms
+        self._pending: deque = deque()
+        self._pending_changed = threading.Condition()
+        self._closed = False
+        self._live_lanes = 0
+        self._threads: List[threading.Thread] = []
+        self._completion_lock = threading.Lock()  # Lanes complete texts of the same request concurrently
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._batched_texts = 0
+        self._requests = 0
+        self._slo_violations = 0
+        self._latencies_ms: deque = deque(maxlen=1000)
+
+    def start(self):
+        self._start_backend()
+        self._live_lanes = self.lanes
+        for lane in range(self.lanes):
+            thread = threading.Thread(target=self._lane_loop, args=(lane,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _start_backend(self):
+        pass
+
+    def _run_batch(self, lane: int, texts: List[str]) -> List[float]:
+        raise NotImplementedError
+
+    def _lane_alive(self, lane: int) -> bool:
+        return True
+
+    @property
+    def healthy(self) -> bool:
+        """Whether any lane can still score texts"""
+        return not self._closed and self._live_lanes > 0
+
+    def score(self, texts: List[str]) -> List[float]:
+        """Return the POSITIVE probability of each text, blocking until scored"""
+        if not texts:
+            return []
+        request = _InferenceRequest(len(texts))
+        with self._pending_changed:
+            if not self.healthy:
+                raise RuntimeError("No inference lanes are running")
+            self._pending.extend((request, index, text) for index, text in enumerate(texts))
+            self._pending_changed.notify()
+
+        if not request.done.wait(INFERENCE_TIMEOUT):
+            raise TimeoutError("Inference request timed out")
+
+        latency_ms = (time.perf_counter() - request.submitted_at) * 1000
+        with self._metrics_lock:
+            self._requests += 1
+            self._latencies_ms.append(latency_ms)
+            if latency_ms > self.latency_slo_ms:
+                self._slo_violations += 1
+
+        if request.error:
+            raise RuntimeError(request.error)
+        return request.scores
+
+    def _collect_batch(self) -> Optional[List[Tuple[_InferenceRequest, int, str]]]:
+        with self._pending_changed:
+            while not self._pending and not self._closed:
+                self._pending_changed.wait()
+            if self._closed:
+                return None
+
+            # Trade a few milliseconds of wait for a fuller batch
+            deadline = time.perf_counter() + self.batch_window
+            while len(self._pending) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._pending_changed.wait(remaining)
+
+            return [self._pending.popleft() for _ in range(min(len(self._pending), self.max_batch_size))]
+
+    def _lane_loop(self, lane: int):
+        while self._lane_alive(lane):
+            items = self._collect_batch()
+            if items is None:
+                return
+            if not items:
+                continue
+
+            try:
+                outcomes = [(score, None) for score in self._run_batch(lane, [text for _, _, text in items])]
+            except Exception as e:
+                outcomes = self._retry_per_request(lane, items, e)
+
+            with self._metrics_lock:
+                self._batches += 1
+                self._batched_texts += len(items)
+
+            with self._completion_lock:
+                for (request, index, _), (score, error) in zip(items, outcomes):
+                    if error:
+                        request.error = error
+                    else:
+                        request.scores[index] = score
+                    request.remaining -= 1
+                    if request.remaining == 0:
+                        request.done.set()
+
+        self._lane_stopped(lane)
+
+    def _retry_per_request(self, lane: int, items: List[Tuple[_InferenceRequest, int, str]],
+                           error: Exception) -> List[Tuple[float, Optional[str]]]:
+        """Rescore a failed shared batch one request at a time, so an error only fails its caller"""
+        positions_by_request: Dict[int, List[int]] = {}
+        for position, (request, _, _) in enumerate(items):
+            positions_by_request.setdefault(id(request), []).append(position)
+        if len(positions_by_request) == 1 or not self._lane_alive(lane):
+            return [(0.0, str(error))] * len(items)
+
+        outcomes: List[Tuple[float, Optional[str]]] = [(0.0, str(error))] * len(items)
+        for positions in positions_by_request.values():
+            try:
+                scores = self._run_batch(lane, [items[position][2] for position in positions])
+                for position, score in zip(positions, scores):
+                    outcomes[position] = (score, None)
+            except Exception as e:
+                for position in positions:
+                    outcomes[position] = (0.0, str(e))
+        return outcomes
+
+    def _lane_stopped(self, lane: int):
+        """Retire a lane whose backend died, failing queued texts once none are left"""
+        logger.error(f"❌ Inference lane {lane} stopped")
+        with self._pending_changed:
+            self._live_lanes -= 1
+            if self._live_lanes > 0:
+                return
+            orphaned = list(self._pending)
+            self._pending.clear()
+        for request, _, _ in orphaned:
+            request.error = "No inference lanes are running"
+            request.done.set()
+
+    def metrics(self) -> Dict:
+        with self._metrics_lock:
+            latencies = sorted(self._latencies_ms)
+            batches = self._batches
+
+            def percentile(p: float) -> Optional[float]:
+                if not latencies:
+                    return None
+                return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 2)
+
+            return {
+                'healthy': self.healthy,
+                'lanes': self.lanes,
+                'live_lanes': self._live_lanes,
+                'queue_depth': len(self._pending),
+                'max_batch_size': self.max_batch_size,
+                'batch_window_ms': self.batch_window * 1000,
+                'batches': batches,
+                'texts_scored': self._batched_texts,
+                'average_batch_size': round(self._batched_texts / batches, 2) if batches else None,
+                'batch_fill_ratio': round(self._batched_texts / (batches * self.max_batch_size), 4) if batches else None,
+                'requests': self._requests,
+                'latency_slo_ms': self.latency_slo_ms,
+                'slo_violations': self._slo_violations,
+                'latency_p50_ms': percentile(0.5),
+                'latency_p95_ms': percentile(0.95),
+                'latency_p99_ms': percentile(0.99)
+            }
+
+    def close(self):
+        self._closed = True
+        with self._pending_changed:
+            self._pending_changed.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=10)
+
+class InProcessInference(InferenceQueue):
+    """Micro-batching in front of the in-process transformers pipeline"""
+
+    def __init__(self, max_batch_size: int = 32, batch_window_ms: float = 5.0, latency_slo_ms: float = 500.0):
+        super().__init__(1, max_batch_size, batch_window_ms, latency_slo_ms)
+
+    def _start_backend(self):
+        initialize_sentiment_pipeline()
+
+    def _run_batch(self, lane: int, texts: List[str]) -> List[float]:
+        results = sentiment_pipeline(texts, batch_size=len(texts), truncation=True)
+        return [next((item['score'] for item in result if item['label'] == 'POSITIVE'), 0.5) for result in results]
+
+class InferencePool(InferenceQueue):
+    """Dedicated inference processes fed through shared-memory batch slots
+
+    One lane per worker process. A lane tokenizes its batch into the worker's
+    shared-memory slot; the worker writes POSITIVE probabilities back into the
+    slot, so only small (size, length) messages cross the process queues.
+    Each lane has its own tokenizer, since a fast tokenizer must not be used
+    from several threads at once.
+    """
+
+    def __init__(self, workers: int, threads_per_worker: int, max_batch_size: int = 32,
+                 batch_window_ms: float = 5.0, latency_slo_ms: float = 500.0,
+                 max_length: int = MODEL_MAX_LENGTH):
+        super().__init__(workers, max_batch_size, batch_window_ms, latency_slo_ms)
+        self.threads_per_worker = threads_per_worker
+        self.max_length = max_length
+        self._tokenizers = []
+        self._context = None
+        self._artifact_dir = None
+        self._slots: List[_SharedBatchSlot] = []
+        self._processes = []
+        self._request_queues = []
+        self._result_queues = []
+
+    def _start_backend(self):
+        from transformers import AutoTokenizer
+
+        artifact_dir = ensure_model_artifacts()
+        self._tokenizers = [AutoTokenizer.from_pretrained(artifact_dir, local_files_only=True)
+                            for _ in range(self.lanes)]
+
+        self._context = multiprocessing.get_context('spawn')
+        self._artifact_dir = str(artifact_dir)
+        for worker_index in range(self.lanes):
+            self._slots.append(_SharedBatchSlot(self.max_batch_size, self.max_length))
+            self._request_queues.append(None)
+            self._result_queues.append(None)
+            self._processes.append(None)
+            self._spawn_worker(worker_index)
+
+        # Wait for every worker to load its model before taking batches
+        try:
+            for worker_index in range(self.lanes):
+                error = self._wait_for_worker(worker_index, INFERENCE_WORKER_START_TIMEOUT)
+                if error:
+                    raise RuntimeError(error)
+        except Exception:
+            self.close()
+            raise
+
+        logger.info(f"✅ Started {self.lanes} inference workers ({self.threads_per_worker} threads each)")
+
+    def _spawn_worker(self, worker_index: int):
+        # Each worker gets fresh queues, so a late reply from a replaced worker is never read
+        request_queue, result_queue = self._context.Queue(), self._context.Queue()
+        process = self._context.Process(
+            target=_inference_worker_main,
+            args=(worker_index, self._slots[worker_index].shm.name, self.max_batch_size, self.max_length,
+                  self.threads_per_worker, self._artifact_dir, request_queue, result_queue),
+            daemon=True
+        )
+        process.start()
+        self._request_queues[worker_index] = request_queue
+        self._result_queues[worker_index] = result_queue
+        self._processes[worker_index] = process
+
+    def _restart_worker(self, lane: int):
+        """Replace a worker that timed out or died before its slot is reused"""
+        process = self._processes[lane]
+        if process.is_alive():
+            process.terminate()
+        process.join(timeout=10)
+
+        self._spawn_worker(lane)
+        try:
+            error = self._wait_for_worker(lane, INFERENCE_WORKER_START_TIMEOUT)
+            if error:
+                raise RuntimeError(error)
+            logger.info(f"✅ Restarted inference worker {lane}")
+        except Exception as e:
+            # The lane retires once its process is gone
+            logger.error(f"❌ Failed to restart inference worker {lane}: {e}")
+            if self._processes[lane].is_alive():
+                self._processes[lane].terminate()
+
+    def _run_batch(self, lane: int, texts: List[str]) -> List[float]:
+        encoded = self._tokenizers[lane](texts, padding=True, truncation=True, max_length=self.max_length, return_tensors='np')
+        batch_size, seq_len = encoded['input_ids'].shape
+        slot = self._slots[lane]
+        slot.input_ids[:batch_size, :seq_len] = encoded['input_ids']
+        slot.attention_mask[:batch_size, :seq_len] = encoded['attention_mask']
+
+        self._request_queues[lane].put((batch_size, seq_len))
+        try:
+            error = self._wait_for_worker(lane, INFERENCE_TIMEOUT)
+        except (RuntimeError, TimeoutError):
+            # An abandoned worker may still be reading this batch or writing its scores
+            self._restart_worker(lane)
+            raise
+        if error:
+            raise RuntimeError(error)
+        return slot.scores[:batch_size].tolist()
+
+    def _wait_for_worker(self, worker_index: int, timeout: float) -> Optional[str]:
+        """Wait for a worker's reply, failing early if the process exits"""
+        process = self._processes[worker_index]
+        results = self._result_queues[worker_index]
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return results.get(timeout=max(0.0, min(1.0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+            if not process.is_alive():
+                try:
+                    return results.get_nowait()  # Replied just before exiting
+                except queue.Empty:
+                    raise RuntimeError(f"Inference worker {worker_index} exited with code {process.exitcode}")
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Inference worker {worker_index} did not reply within {timeout:.0f}s")
+
+    def _lane_alive(self, lane: int) -> bool:
+        return self._processes[lane].is_alive()
+
+    def close(self):
+        super().close()
+        for request_queue in self._request_queues:
+            request_queue.put(None)
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        for slot in self._slots:
+            slot.close(unlink=True)
+        logger.info("Inference workers stopped")
+
+def start_inference_queue():
+    """Start micro-batched inference, in worker processes or in-process"""
+    global inference_queue
+    if inference_queue is not None:
+        return
+    # Worker processes load the real model, so the stub scorer always runs in-process
+    if INFERENCE_WORKERS > 0 and SENTIMENT_BACKEND != "stub":
+        pool = InferencePool(INFERENCE_WORKERS, INFERENCE_THREADS, INFERENCE_MAX_BATCH_SIZE,
+                             INFERENCE_BATCH_WINDOW_MS, INFERENCE_LATENCY_SLO_MS)
+        try:
+            pool.start()
+            inference_queue = pool
+            return
+        except Exception as e:
+            logger.error(f"❌ Failed to start inference workers, falling back to in-process inference: {e}")
+    try:
+        queue_impl = InProcessInference(INFERENCE_MAX_BATCH_SIZE, INFERENCE_BATCH_WINDOW_MS, INFERENCE_LATENCY_SLO_MS)
+        queue_impl.start()
+        inference_queue = queue_impl
+    except Exception as e:
+        logger.error(f"❌ Failed to start inference: {e}")
+        raise
+
+def sentiment_model_ready() -> bool:
+    return (inference_queue is not None and inference_queue.healthy) or sentiment_pipeline is not None
+
+def summarize_sentiment_scores(sentiment_scores: List[float]) -> Dict:
+    """Aggregate per-review POSITIVE probabilities"""
+    positive_count = sum(1 for score in sentiment_scores if score > 0.5)
+
+    return {
+        'average_sentiment': sum(sentiment_scores) / len(sentiment_scores),
+        'positive_ratio': positive_count / len(sentiment_scores),
+        'scores': sentiment_scores
+    }
+
+def analyze_sentiment_batch(reviews: List[str]) -> Dict:
+    """Analyze sentiment for a batch of reviews"""
+    if not reviews or not sentiment_model_ready():
+        return {'average_sentiment': 0.5, 'positive_ratio': 0.5}
+    
+    try:
+        # Analyze sentiment for all reviews
+        if inference_queue is not None and inference_queue.healthy:
+            sentiment_scores = inference_queue.score(reviews)
+        else:
+            results = sentiment_pipeline(reviews, batch_size=INFERENCE_MAX_BATCH_SIZE, truncation=True)
+            # Extract positive score
+            sentiment_scores = [next((item['score'] for item in result if item['label'] == 'POSITIVE'), 0.5)
+                                for result in results]
+        
+        return summarize_sentiment_scores(sentiment_scores)
+        
+    except Exception as e:
+        logger.error(f"Error in sentiment analysis: {e}")
+        return {'average_sentiment': 0.5, 'positive_ratio': 0.5}
+
+def _positive_probability(result: List[Dict]) -> float:
+    """Collapse positive/negative(/neutral) or 1-5 star label scores into a POSITIVE probability"""
+    scores = {item['label'].lower(): item['score'] for item in result}
+    stars = {int(label[0]): score for label, score in scores.items() if label[:1].isdigit()}
+    if len(stars) > 1:
+        top = max(stars)
+        return sum((star - 1) / (top - 1) * score for star, score in stars.items())
+    positive = next((score for label, score in scores.items() if label.startswith('pos')), None)
+    if positive is None:
+        return 0.5
+    return positive + 0.5 * scores.get('neutral', 0.0)
+
+def analyze_routed_sentiment(english: List[str], routed: List[str]) -> Tuple[List[str], Dict]:
+    """Score English reviews with the main model and routed reviews with the multilingual one
+
+    Returns the reviews that were scored, in score order, and their aggregates.
+    """
+    sentiment_data = analyze_sentiment_batch(english)
+    if not routed or (english and 'scores' not in sentiment_data):
+        return english, sentiment_data
+
+    try:
+        initialize_multilingual_pipeline()
+        routed_scores = [_positive_probability(result) for result in multilingual_pipeline(routed, truncation=True)]
+    except Exception as e:
+        logger.error(f"❌ Error in multilingual sentiment analysis: {e}")
+        return english, sentiment_data
+
+    return english + routed, summarize_sentiment_scores(sentiment_data.get('scores', []) + routed_scores)
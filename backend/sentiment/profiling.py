@@ -0,0 +1,94 @@
+"""
+Sampling CPU profiler for on-demand profiling of a refresh run
+"""
+
+import os
+import sys
+import threading
+from typing import Dict, List
+
+from .schemas import ProfileFunction
+
+# Threads parked waiting for work. Threads blocked on a result, such as scoring
+# threads waiting on the inference queue, are kept so that wait shows up.
+_IDLE_LEAVES = {('selectors.py', 'select')}  # Event loop waiting for I/O
+_IDLE_CALLERS = {
+    ('thread.py', '_worker'),  # Executor thread waiting for a work item
+    ('inference.py', '_collect_batch'),  # Inference lane waiting for texts
+}
+_WAIT_MODULES = {'threading.py', 'queue.py'}
+
+def _frame_key(frame) -> tuple:
+    return os.path.basename(frame.f_code.co_filename), frame.f_code.co_name
+
+def _is_idle(frame) -> bool:
+    if _frame_key(frame) in _IDLE_LEAVES:
+        return True
+    # Judge a blocked thread by the code that called into threading or queue
+    while frame is not None and _frame_key(frame)[0] in _WAIT_MODULES:
+        frame = frame.f_back
+    return frame is not None and _frame_key(frame) in _IDLE_CALLERS
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler over every thread of the process
+
+    A background thread snapshots all stacks with ``sys._current_frames()`` at a
+    fixed interval and counts them as collapsed stacks, the input format of
+    flamegraph.pl and speedscope. Scraping and scoring run in worker threads,
+    so parsing, regex loops and time spent waiting on inference all show up.
+    Samples of idle executor threads, inference lanes and the event loop are
+    dropped.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if _is_idle(frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                key = ';'.join(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def collapsed(self) -> str:
+        return '\n'.join(f"{stack} {count}" for stack, count in sorted(self.stacks.items()))
+
+    def hot_functions(self, top: int) -> List[ProfileFunction]:
+        """Functions by self samples (leaf frame), with inclusive samples alongside"""
+        self_counts: Dict[str, int] = {}
+        totals: Dict[str, int] = {}
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            self_counts[frames[-1]] = self_counts.get(frames[-1], 0) + count
+            for function in set(frames):
+                totals[function] = totals.get(function, 0) + count
+        all_samples = sum(self.stacks.values()) or 1
+        ranked = sorted(self_counts.items(), key=lambda item: item[1], reverse=True)[:top]
+        return [ProfileFunction(
+            function=function,
+            self_samples=count,
+            total_samples=totals[function],
+            self_percent=round(100 * count / all_samples, 2),
+            total_percent=round(100 * totals[function] / all_samples, 2)
+        ) for function, count in ranked]
@@ -0,0 +1,119 @@
+"""
+Compact slotted records carried through the pipeline
+"""
+
+import re
+import sys
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional
+
+from .identity import canonical_product_url, extract_asin, product_index
+
+if TYPE_CHECKING:
+    from .schemas import SmartphoneData
+
+# Pydantic models are only built at the response boundary
+_PRICE_DIGITS = re.compile(r'[\d,]+(?:\.\d+)?')
+
+def parse_price(price: Optional[str]) -> Optional[float]:
+    """Parse a display price such as '₹1,34,900' into a number"""
+    if not price:
+        return None
+    match = _PRICE_DIGITS.search(price)
+    if not match:
+        return None
+    try:
+        return float(match.group().replace(',', ''))
+    except ValueError:
+        return None
+
+class ProductRecord:
+    """A bestseller listing with its canonical product identity"""
+
+    __slots__ = ('asin', 'product_id', 'name', 'link', 'price', 'price_value', 'rating', 'rank')
+
+    def __init__(self, name: str, link: str, price: Optional[str], rating: Optional[float], rank: int):
+        asin = extract_asin(link)
+        self.asin = sys.intern(asin) if asin else None
+        self.product_id = sys.intern(product_index.resolve(asin, name)) if asin else None
+        self.name = name
+        self.link = canonical_product_url(asin) if asin else link
+        self.price = price
+        self.price_value = parse_price(price)
+        self.rating = rating
+        self.rank = rank
+
+class ScoredProduct:
+    """A product together with its review sentiment aggregates"""
+
+    __slots__ = ('product', 'review_count', 'average_sentiment', 'positive_ratio', 'composite_score',
+                 'duplicate_ratio', 'aspects', 'scored_at')
+
+    def __init__(self, product: ProductRecord, review_count: int, average_sentiment: float, positive_ratio: float,
+                 composite_score: float, duplicate_ratio: Optional[float], aspects: Optional[Dict[str, Dict]]):
+        self.product = product
+        self.review_count = review_count
+        self.average_sentiment = average_sentiment
+        self.positive_ratio = positive_ratio
+        self.composite_score = composite_score
+        self.duplicate_ratio = duplicate_ratio
+        self.aspects = aspects
+        self.scored_at = time.time()
+
+    def to_dict(self) -> Dict:
+        """JSON-ready representation matching SmartphoneData"""
+        return {
+            'name': self.product.name,
+            'link': self.product.link,
+            'price': self.product.price,
+            'price_value': self.product.price_value,
+            'product_id': self.product.product_id,
+            'rating': self.product.rating,
+            'review_count': self.review_count,
+            'average_sentiment': self.average_sentiment,
+            'positive_ratio': self.positive_ratio,
+            'composite_score': self.composite_score,
+            'duplicate_ratio': self.duplicate_ratio,
+            'aspects': self.aspects,
+            'bestseller_rank': self.product.rank,
+            'last_updated': datetime.fromtimestamp(self.scored_at).isoformat()
+        }
+
+    def to_model(self, composite_score: Optional[float] = None) -> 'SmartphoneData':
+        """Build the response model, optionally with the score of another formula"""
+        from .schemas import SmartphoneData
+
+        return SmartphoneData(
+            name=self.product.name,
+            link=self.product.link,
+            price=self.product.price,
+            price_value=self.product.price_value,
+            product_id=self.product.product_id,
+            rating=self.product.rating,
+            review_count=self.review_count,
+            average_sentiment=self.average_sentiment,
+            positive_ratio=self.positive_ratio,
+            composite_score=self.composite_score if composite_score is None else composite_score,
+            duplicate_ratio=self.duplicate_ratio,
+            aspects=self.aspects,
+            bestseller_rank=self.product.rank,
+            last_updated=datetime.fromtimestamp(self.scored_at)
+        )
+
+    @classmethod
+    def from_model(cls, smartphone_data: 'SmartphoneData') -> 'ScoredProduct':
+        """Rebuild a record from stored response data"""
+        scored = cls(
+            product=ProductRecord(smartphone_data.name, smartphone_data.link, smartphone_data.price,
+                                  smartphone_data.rating, smartphone_data.bestseller_rank or 0),
+            review_count=smartphone_data.review_count,
+            average_sentiment=smartphone_data.average_sentiment,
+            positive_ratio=smartphone_data.positive_ratio,
+            composite_score=smartphone_data.composite_score,
+            duplicate_ratio=smartphone_data.duplicate_ratio,
+            aspects={aspect: sentiment.dict() for aspect, sentiment in smartphone_data.aspects.items()}
+            if smartphone_data.aspects else None
+        )
+        scored.scored_at = smartphone_data.last_updated.timestamp()
+        return scored
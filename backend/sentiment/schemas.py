@@ -0,0 +1,121 @@
+"""
+Pydantic models of the API responses and requests
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+class AspectSentiment(BaseModel):
+    mentions: int
+    average_sentiment: float
+    positive_ratio: float
+
+class SmartphoneData(BaseModel):
+    name: str
+    link: str
+    price: Optional[str] = None
+    price_value: Optional[float] = None
+    product_id: Optional[str] = None
+    rating: Optional[float] = None
+    review_count: Optional[int] = None
+    average_sentiment: float
+    positive_ratio: float
+    composite_score: float
+    duplicate_ratio: Optional[float] = None
+    aspects: Optional[Dict[str, AspectSentiment]] = None
+    bestseller_rank: Optional[int] = None
+    last_updated: datetime
+
+class ScoringFormulaInfo(BaseModel):
+    name: str
+    description: str
+    rank_weight: float
+    sentiment_weight: float
+    prior_weight: float
+    prior_mean: float
+
+class ReviewScore(BaseModel):
+    text: str
+    score: float
+    sentiment: str
+
+class ReviewsPage(BaseModel):
+    asin: str
+    name: Optional[str] = None
+    total: int
+    offset: int
+    limit: int
+    counts: Dict[str, int]
+    reviews: List[ReviewScore]
+    last_updated: datetime
+
+class AnalyzeRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=256)
+
+class AnalyzeResponse(BaseModel):
+    results: List[ReviewScore]
+    average_sentiment: float
+    positive_ratio: float
+
+class HistoryPoint(BaseModel):
+    timestamp: datetime
+    rank: int
+    composite_score: float
+    positive_ratio: float
+    average_sentiment: float
+    review_count: Optional[int] = None
+    rating: Optional[float] = None
+
+class HistoryResponse(BaseModel):
+    asin: str
+    points: List[HistoryPoint]
+
+class RefreshResponse(BaseModel):
+    detail: str
+    timestamp: datetime
+    job_id: Optional[str] = None
+    status_url: Optional[str] = None
+
+class JobStage(BaseModel):
+    name: str
+    status: str
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+
+class ProfileFunction(BaseModel):
+    function: str
+    self_samples: int
+    total_samples: int
+    self_percent: float
+    total_percent: float
+
+class ProfileAllocation(BaseModel):
+    location: str
+    size_kb: float
+    count: int
+
+class ProfileResponse(BaseModel):
+    duration_seconds: float
+    interval_ms: float
+    samples: int
+    result_count: int
+    hot_functions: List[ProfileFunction]
+    collapsed_stacks: str
+    memory_peak_kb: Optional[float] = None
+    top_allocations: List[ProfileAllocation]
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    processed: int = 0
+    total: Optional[int] = None
+    stages: List[JobStage]
+    result_count: Optional[int] = None
+    error: Optional[str] = None
@@ -0,0 +1,293 @@
+"""
+Aspect sentiment, composite scores, ranking formulas and per-product scoring
+"""
+
+import logging
+import re
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from .inference import analyze_routed_sentiment, analyze_sentiment_batch, sentiment_model_ready, summarize_sentiment_scores
+from .records import ProductRecord, ScoredProduct
+from .storage import review_store
+from .text import deduplicate_reviews, detect_review_language, review_filter
+
+if TYPE_CHECKING:
+    from .schemas import ScoringFormulaInfo, SmartphoneData
+    from .scraper import AmazonScraper
+
+logger = logging.getLogger(__name__)
+
+# Aspect keyword index: phrases are matched longest first in a single compiled pattern
+ASPECT_KEYWORDS = {
+    'battery': ['battery', 'battery life', 'backup', 'charging', 'charger', 'fast charging', 'mah', 'drain', 'drains'],
+    'camera': ['camera', 'cameras', 'photo', 'photos', 'picture', 'pictures', 'selfie', 'video', 'videos', 'lens', 'zoom'],
+    'display': ['display', 'screen', 'amoled', 'brightness', 'refresh rate', 'resolution'],
+    'performance': ['performance', 'processor', 'lag', 'laggy', 'gaming', 'speed', 'smooth', 'ram', 'heating', 'heats'],
+    'build': ['build', 'build quality', 'design', 'body', 'weight', 'premium', 'glass', 'finish'],
+    'software': ['software', 'ui', 'os', 'android', 'ios', 'update', 'updates', 'bloatware', 'miui', 'oxygenos'],
+    'audio': ['speaker', 'speakers', 'sound', 'audio', 'volume'],
+    'value': ['price', 'value', 'value for money', 'money', 'worth', 'cost']
+}
+_ASPECT_BY_KEYWORD = {keyword: aspect for aspect, keywords in ASPECT_KEYWORDS.items() for keyword in keywords}
+_ASPECT_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(k) for k in sorted(_ASPECT_BY_KEYWORD, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+def extract_aspect_sentences(review: str) -> Dict[str, List[str]]:
+    """Map each aspect mentioned in a review to the sentences mentioning it"""
+    aspect_sentences: Dict[str, List[str]] = {}
+    for sentence in _SENTENCE_SPLIT.split(review):
+        aspects = {_ASPECT_BY_KEYWORD[match.lower()] for match in _ASPECT_PATTERN.findall(sentence)}
+        for aspect in aspects:
+            aspect_sentences.setdefault(aspect, []).append(sentence.strip())
+    return aspect_sentences
+
+def analyze_aspect_sentiment(reviews: List[str], review_scores: Optional[List[float]] = None) -> Dict[str, Dict]:
+    """Aggregate sentiment per aspect (battery, camera, display...) across reviews
+
+    Every distinct aspect sentence is scored once, in a single model pass for
+    all aspects. Sentences that are a whole review reuse its review-level score,
+    so single-sentence reviews cost no extra inference. Sentences are scored by
+    the English model, so only English reviews should be passed.
+    """
+    if not reviews or not sentiment_model_ready():
+        return {}
+
+    known_scores: Dict[str, float] = {}
+    if review_scores:
+        known_scores = {review.strip(): score for review, score in zip(reviews, review_scores)}
+
+    mentions: Dict[str, List[str]] = {}
+    for review in reviews:
+        for aspect, sentences in extract_aspect_sentences(review).items():
+            mentions.setdefault(aspect, []).extend(sentences)
+
+    pending = list({sentence for sentences in mentions.values() for sentence in sentences
+                    if sentence and sentence not in known_scores})
+    if pending:
+        try:
+            scores = analyze_sentiment_batch(pending).get('scores')
+            if scores is None:
+                return {}
+            known_scores.update(zip(pending, scores))
+        except Exception as e:
+            logger.error(f"Error in aspect sentiment analysis: {e}")
+            return {}
+
+    aspects = {}
+    for aspect, sentences in mentions.items():
+        scores = [known_scores[sentence] for sentence in sentences if sentence in known_scores]
+        if not scores:
+            continue
+        aspects[aspect] = {
+            'mentions': len(scores),
+            'average_sentiment': round(sum(scores) / len(scores), 4),
+            'positive_ratio': round(sum(1 for score in scores if score > 0.5) / len(scores), 4)
+        }
+    return aspects
+
+def calculate_composite_score(rank: int, positive_ratio: float, rank_weight: float = 0.4,
+                              sentiment_weight: float = 0.6) -> float:
+    """Calculate composite score based on rank and sentiment"""
+    # Normalize rank (lower rank = higher score)
+    rank_score = 1.0 / rank if rank > 0 else 0
+    
+    # Composite score: 40% rank, 60% sentiment by default
+    composite_score = rank_weight * rank_score + sentiment_weight * positive_ratio
+    
+    return round(composite_score, 4)
+
+# Ranking formulas
+class ScoringFormula:
+    """A named weighting of bestseller rank and review sentiment
+
+    With a ``prior_weight`` the positive ratio is smoothed toward ``prior_mean``
+    as if that many extra reviews had been seen, so products with a handful of
+    glowing reviews do not outrank well-reviewed ones.
+    """
+
+    __slots__ = ('name', 'description', 'rank_weight', 'sentiment_weight', 'prior_weight', 'prior_mean')
+
+    def __init__(self, name: str, description: str, rank_weight: float, sentiment_weight: float,
+                 prior_weight: float = 0.0, prior_mean: float = 0.5):
+        self.name = name
+        self.description = description
+        self.rank_weight = rank_weight
+        self.sentiment_weight = sentiment_weight
+        self.prior_weight = prior_weight
+        self.prior_mean = prior_mean
+
+    def score(self, rank: int, positive_ratio: float, review_count: Optional[int]) -> float:
+        if self.prior_weight:
+            count = review_count or 0
+            positive_ratio = (positive_ratio * count + self.prior_mean * self.prior_weight) / (count + self.prior_weight)
+        return calculate_composite_score(rank, positive_ratio, self.rank_weight, self.sentiment_weight)
+
+    def to_info(self) -> 'ScoringFormulaInfo':
+        from .schemas import ScoringFormulaInfo
+
+        return ScoringFormulaInfo(
+            name=self.name,
+            description=self.description,
+            rank_weight=self.rank_weight,
+            sentiment_weight=self.sentiment_weight,
+            prior_weight=self.prior_weight,
+            prior_mean=self.prior_mean
+        )
+
+DEFAULT_SCORING_FORMULA = "default"
+SCORING_FORMULAS = {
+    formula.name: formula for formula in (
+        ScoringFormula(DEFAULT_SCORING_FORMULA, "40% bestseller rank, 60% positive review ratio", 0.4, 0.6),
+        ScoringFormula("sentiment", "20% bestseller rank, 80% positive review ratio", 0.2, 0.8),
+        ScoringFormula("popularity", "70% bestseller rank, 30% positive review ratio", 0.7, 0.3),
+        ScoringFormula("bayesian", "Default weights with the positive ratio smoothed toward 0.5 by review count",
+                       0.4, 0.6, prior_weight=10, prior_mean=0.5),
+    )
+}
+
+class RankingIndex:
+    """Scored products kept in order under every scoring formula at once
+
+    Each formula has a sorted list of ``(-score, sequence, key)`` entries, so
+    adding or replacing a product is O(log n) per formula and the top k under
+    any formula is a slice. Ties keep the order products were added in.
+    """
+
+    def __init__(self, formulas: Optional[Dict[str, ScoringFormula]] = None):
+        self.formulas = formulas or SCORING_FORMULAS
+        self._orders = {name: SortedList() for name in self.formulas}
+        self._entries: Dict[str, Tuple[ScoredProduct, Dict[str, Tuple]]] = {}
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, scored: ScoredProduct):
+        """Add a scored product, replacing any earlier score for the same product"""
+        key = scored.product.product_id or scored.product.link
+        self.remove(key)
+        self._sequence += 1
+        sort_keys = {}
+        for name, formula in self.formulas.items():
+            score = formula.score(scored.product.rank, scored.positive_ratio, scored.review_count)
+            sort_keys[name] = (-score, self._sequence, key)
+            self._orders[name].add(sort_keys[name])
+        self._entries[key] = (scored, sort_keys)
+
+    def remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for name, sort_key in entry[1].items():
+                self._orders[name].remove(sort_key)
+
+    def top(self, formula: str = DEFAULT_SCORING_FORMULA, k: int = 10) -> List[Tuple[ScoredProduct, float]]:
+        """The k best products under a formula, with their scores"""
+        return [(self._entries[key][0], -negated_score) for negated_score, _, key in self._orders[formula][:k]]
+
+    def top_models(self, formula: str = DEFAULT_SCORING_FORMULA, k: int = 10) -> List['SmartphoneData']:
+        return [scored.to_model(composite_score=score) for scored, score in self.top(formula, k)]
+
+    @classmethod
+    def from_models(cls, smartphones_data: List['SmartphoneData']) -> 'RankingIndex':
+        """Rebuild an index from stored rankings"""
+        index = cls()
+        for smartphone_data in smartphones_data:
+            index.update(ScoredProduct.from_model(smartphone_data))
+        return index
+
+def prepare_reviews(reviews: List[str]) -> Tuple[List[str], List[str], float]:
+    """Deduplicate and filter scraped reviews, returning (english, routed, duplicate ratio)"""
+    # Drop duplicate and boilerplate reviews before inference
+    reviews, dedup_stats = deduplicate_reviews(reviews)
+    duplicate_ratio = dedup_stats['dedup_ratio']
+    if duplicate_ratio:
+        logger.info(f"Dropped {dedup_stats['total'] - dedup_stats['unique']} duplicate reviews "
+                    f"(dedup ratio {duplicate_ratio:.2%})")
+
+    # Skip page text and keep non-English reviews away from the English model
+    english_reviews, routed_reviews = review_filter.route(reviews)
+    if len(english_reviews) + len(routed_reviews) < len(reviews):
+        logger.info(f"Filtered {len(reviews) - len(english_reviews) - len(routed_reviews)} non-review "
+                    f"or non-English texts")
+    return english_reviews, routed_reviews, duplicate_ratio
+
+def score_smartphone(scraper: 'AmazonScraper', phone: ProductRecord) -> ScoredProduct:
+    """Fetch, deduplicate and score the reviews of a single smartphone"""
+    logger.info(f"Processing: {phone.name[:50]}...")
+
+    # Get reviews; blocked pages return none
+    reviews = scraper.get_product_reviews(phone.asin, max_reviews=50)
+    english_reviews, routed_reviews, duplicate_ratio = prepare_reviews(reviews) if reviews else ([], [], None)
+
+    # Without fresh reviews that survive filtering, reuse the ones scored for this product
+    # in an earlier refresh instead of overwriting them
+    fresh_reviews = bool(english_reviews or routed_reviews)
+    stored = review_store.load(phone.product_id) if not fresh_reviews and phone.product_id else None
+    if stored and stored['reviews']:
+        logger.info(f"Reusing {len(stored['reviews'])} stored reviews for {phone.product_id}")
+        reviews = [review['text'] for review in stored['reviews']]
+        sentiment_data = summarize_sentiment_scores([review['score'] for review in stored['reviews']])
+        duplicate_ratio = stored.get('duplicate_ratio')
+        # Stored reviews include routed ones, which the aspect pass must not see
+        english = [review for review in stored['reviews'] if detect_review_language(review['text']) == 'en']
+        aspect_reviews = [review['text'] for review in english]
+        aspect_scores = [review['score'] for review in english]
+    else:
+        # Without scraped or stored reviews, score placeholders; they are never stored
+        if not fresh_reviews:
+            english_reviews, routed_reviews, duplicate_ratio = prepare_reviews([
+                "Good phone with decent features",
+                "Value for money product",
+                "Camera quality is satisfactory",
+                "Battery life is okay",
+                "Build quality could be better"
+            ])
+
+        # Analyze sentiment; English reviews come first in the scored reviews
+        reviews, sentiment_data = analyze_routed_sentiment(english_reviews, routed_reviews)
+        aspect_reviews = english_reviews
+        aspect_scores = sentiment_data['scores'][:len(english_reviews)] if 'scores' in sentiment_data else None
+
+        # Keep the scored reviews so the dashboard can show them without a rescrape
+        if fresh_reviews and phone.product_id and 'scores' in sentiment_data:
+            try:
+                review_store.save(phone.product_id, phone.name, reviews, sentiment_data['scores'], duplicate_ratio)
+            except Exception as e:
+                logger.error(f"❌ Error saving reviews for {phone.product_id}: {e}")
+
+    # Per-aspect sentiment from the English sentences mentioning each aspect
+    aspects = analyze_aspect_sentiment(aspect_reviews, aspect_scores)
+
+    # Calculate composite score
+    composite_score = calculate_composite_score(
+        phone.rank,
+        sentiment_data['positive_ratio']
+    )
+
+    return ScoredProduct(
+        product=phone,
+        review_count=len(reviews),
+        average_sentiment=round(sentiment_data['average_sentiment'], 4),
+        positive_ratio=round(sentiment_data['positive_ratio'], 4),
+        composite_score=composite_score,
+        duplicate_ratio=duplicate_ratio,
+        aspects=aspects or None
+    )
+
+def merge_variant_listings(smartphones: List[ProductRecord]) -> List[ProductRecord]:
+    """Keep the best-ranked listing of each canonical product"""
+    seen = set()
+    unique = []
+    for phone in smartphones:
+        key = phone.product_id or phone.link
+        if key in seen:
+            logger.info(f"Skipping variant listing {phone.asin} of {phone.product_id}")
+            continue
+        seen.add(key)
+        unique.append(phone)
+    return unique
@@ -0,0 +1,338 @@
+"""
+Amazon bestseller and review scraping, plus an offline stand-in
+"""
+
+import logging
+import random
+import re
+import time
+from typing import List, Optional
+
+from .config import AMAZON_BASE_URL, SCRAPER_BACKEND, STUB_SCRAPER_DELAY
+from .records import ProductRecord
+from .text import clean_text
+
+logger = logging.getLogger(__name__)
+
+class AmazonScraper:
+    """Amazon scraper for smartphones and reviews"""
+
+    request_delay = 1  # Seconds between products, to be respectful
+    
+    def __init__(self):
+        import requests  # Imported here so the stub scraper and scorer never load it
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+        })
+    
+    def get_bestseller_smartphones(self, limit: int = 20) -> List[ProductRecord]:
+        """Scrape Amazon India's bestseller smartphones"""
+        url = "https://www.amazon.in/gp/bestsellers/electronics/1805560031"
+
+        try:
+            logger.info(f"Scraping bestsellers from: {url}")
+            response = self.session.get(url, timeout=15)
+            response.raise_for_status()
+
+            from bs4 import BeautifulSoup
+
+            soup = BeautifulSoup(response.content, 'lxml')
+            smartphones = []
+
+            # First try: Look for direct product links with smartphone keywords
+            logger.info("Trying direct product link extraction...")
+            product_links = soup.find_all('a', href=re.compile(r'/dp/'))
+
+            for i, link in enumerate(product_links):
+                try:
+                    name = link.get_text(strip=True)
+                    href = link.get('href', '')
+
+                    if name and len(name) > 15:  # Reasonable product name length
+                        name_lower = name.lower()
+                        # Check for smartphone keywords
+                        smartphone_keywords = ['phone', 'mobile', 'smartphone', 'iphone', 'samsung', 'oneplus', 'xiaomi', 'oppo', 'vivo', 'realme', 'redmi', 'poco', 'motorola', 'nokia', 'huawei', 'honor']
+
+                        if any(keyword in name_lower for keyword in smartphone_keywords):
+                            if not href.startswith('http'):
+                                href = f"https://www.amazon.in{href}"
+
+                            # Try to find price in the parent container
+                            price = None
+                            parent = link.find_parent()
+                            for _ in range(5):  # Look up to 5 levels up
+                                if parent:
+                                    price_elem = parent.find('span', string=re.compile(r'₹|Rs'))
+                                    if not price_elem:
+                                        price_elem = parent.find('span', class_=re.compile(r'price'))
+                                    if price_elem:
+                                        price = price_elem.get_text(strip=True)
+                                        break
+                                    parent = parent.find_parent()
+                                else:
+                                    break
+
+                            smartphones.append(ProductRecord(name, href, price, None, len(smartphones) + 1))
+                            logger.info(f"✅ Extracted: {name[:60]}...")
+
+                            if len(smartphones) >= limit:
+                                break
+
+                except Exception as e:
+                    logger.warning(f"Error processing link {i}: {e}")
+                    continue
+
+            if smartphones:
+                logger.info(f"Successfully extracted {len(smartphones)} smartphones using direct link method")
+                return smartphones[:limit]
+
+            # Second try: Container-based approach
+            logger.info("Trying container-based extraction...")
+            selectors = [
+                'div[data-asin]',
+                'div[id*="gridItemRoot"]',
+                'div[class*="zg-item"]'
+            ]
+
+            product_containers = []
+            for selector in selectors:
+                try:
+                    containers = soup.select(selector)
+                    if containers:
+                        product_containers = containers
+                        logger.info(f"Found {len(containers)} containers using selector: {selector}")
+                        break
+                except Exception as e:
+                    logger.warning(f"Selector {selector} failed: {e}")
+                    continue
+
+            if not product_containers:
+                logger.warning("No product containers found with any selector")
+                return []
+
+            logger.info(f"Found {len(product_containers)} product containers")
+
+            for i, container in enumerate(product_containers[:limit]):
+                try:
+                    # Look for product links within container
+                    link_elem = container.find('a', href=re.compile(r'/dp/'))
+                    if not link_elem:
+                        continue
+
+                    name = link_elem.get_text(strip=True)
+                    link = link_elem.get('href', '')
+
+                    if not name or len(name) < 15:
+                        continue
+
+                    # Filter for smartphone keywords
+                    name_lower = name.lower()
+                    smartphone_keywords = ['phone', 'mobile', 'smartphone', 'iphone', 'samsung', 'oneplus', 'xiaomi', 'oppo', 'vivo', 'realme', 'redmi', 'poco', 'motorola', 'nokia']
+
+                    if not any(keyword in name_lower for keyword in smartphone_keywords):
+                        continue
+
+                    if link and not link.startswith('http'):
+                        link = f"https://www.amazon.in{link}"
+
+                    # Extract price
+                    price = None
+                    price_selectors = [
+                        'span[class*="price"]',
+                        '.a-price-whole',
+                        '.a-price',
+                        'span[class*="symbol"]'
+                    ]
+
+                    for price_sel in price_selectors:
+                        try:
+                            price_elem = container.select_one(price_sel)
+                            if price_elem:
+                                price_text = price_elem.get_text(strip=True)
+                                if '₹' in price_text or 'Rs' in price_text:
+                                    price = price_text
+                                    break
+                        except:
+                            continue
+
+                    # Extract rating
+                    rating = None
+                    rating_elem = container.find('span', {'class': re.compile(r'.*rating.*|.*star.*')})
+                    if rating_elem:
+                        rating_text = rating_elem.get_text(strip=True)
+                        rating_match = re.search(r'(\d+\.?\d*)', rating_text)
+                        if rating_match:
+                            try:
+                                rating = float(rating_match.group(1))
+                                if rating > 5:  # Probably out of 5 scale
+                                    rating = rating / 10 * 5
+                            except:
+                                pass
+
+                    smartphones.append(ProductRecord(name, link, price, rating, len(smartphones) + 1))
+                    logger.info(f"✅ Container extracted: {name[:60]}...")
+
+                except Exception as e:
+                    logger.warning(f"Error extracting from container {i}: {e}")
+                    continue
+
+            logger.info(f"Successfully extracted {len(smartphones)} smartphones")
+            return smartphones
+
+        except Exception as e:
+            logger.error(f"Error scraping bestsellers: {e}")
+            return []
+    
+    def get_product_reviews(self, asin: Optional[str], max_reviews: int = 50) -> List[str]:
+        """Extract reviews for a specific product
+
+        Returns an empty list when the page has no review markup, e.g. a captcha.
+        """
+        if not asin:
+            return []
+
+        try:
+            reviews_url = f"{AMAZON_BASE_URL}/product-reviews/{asin}?reviewerType=all_reviews&language=en_IN&sortBy=recent"
+
+            logger.info(f"Fetching reviews from: {reviews_url}")
+            response = self.session.get(reviews_url, timeout=15)
+            response.raise_for_status()
+
+            from bs4 import BeautifulSoup
+
+            soup = BeautifulSoup(response.content, 'lxml')
+            reviews = []
+
+            # Try multiple selectors for review containers
+            review_selectors = [
+                'div[data-hook="review"]',
+                'div[class*="review"]',
+                'div[id*="review"]',
+                '.review-item',
+                '.cr-original-review-text'
+            ]
+
+            review_containers = []
+            for selector in review_selectors:
+                try:
+                    containers = soup.select(selector)
+                    if containers:
+                        review_containers = containers
+                        logger.info(f"Found {len(containers)} review containers using: {selector}")
+                        break
+                except:
+                    continue
+
+            if not review_containers:
+                # Fallback: look for any text that looks like reviews
+                logger.info("Trying fallback review extraction...")
+                all_spans = soup.find_all('span')
+                for span in all_spans:
+                    text = span.get_text(strip=True)
+                    if len(text) > 50 and len(text) < 1000:  # Reasonable review length
+                        # Check if it looks like a review (contains common review words)
+                        review_indicators = ['good', 'bad', 'excellent', 'poor', 'love', 'hate', 'recommend', 'buy', 'purchase', 'quality', 'price', 'value', 'phone', 'mobile']
+                        if any(indicator in text.lower() for indicator in review_indicators):
+                            cleaned_text = clean_text(text)
+                            if len(cleaned_text) > 20:
+                                reviews.append(cleaned_text)
+                                if len(reviews) >= max_reviews:
+                                    break
+
+                # Blocked or empty pages yield no reviews; the caller decides what to fall back to
+                if not reviews:
+                    logger.warning(f"No reviews found for {asin}")
+            else:
+                # Extract from found containers
+                for container in review_containers[:max_reviews]:
+                    try:
+                        # Try multiple selectors for review text
+                        text_selectors = [
+                            'span[data-hook="review-body"]',
+                            '.cr-original-review-text',
+                            '.review-text',
+                            'span[class*="review"]',
+                            'div[class*="text"]'
+                        ]
+
+                        review_text = None
+                        for text_sel in text_selectors:
+                            review_elem = container.select_one(text_sel)
+                            if review_elem:
+                                review_text = review_elem.get_text(strip=True)
+                                break
+
+                        if not review_text:
+                            # Get all text from container
+                            review_text = container.get_text(strip=True)
+
+                        if review_text:
+                            cleaned_text = clean_text(review_text)
+                            if len(cleaned_text) > 20:  # Minimum length filter
+                                reviews.append(cleaned_text)
+
+                    except Exception as e:
+                        logger.warning(f"Error extracting review: {e}")
+                        continue
+
+            logger.info(f"Extracted {len(reviews)} reviews")
+            return reviews
+
+        except Exception as e:
+            logger.error(f"Error fetching reviews for {asin}: {e}")
+            return []
+
+class StubScraper:
+    """Offline stand-in for AmazonScraper serving deterministic listings and reviews
+
+    Selected with SCRAPER_BACKEND=stub for load tests and local development.
+    Every fetch sleeps for STUB_SCRAPER_DELAY to simulate network latency.
+    """
+
+    request_delay = 0
+    REVIEW_SENTENCES = [
+        "Great phone, the battery easily lasts a full day.",
+        "Camera quality is excellent in daylight.",
+        "Display is bright and sharp, I love it.",
+        "Performance is smooth for gaming and everyday apps.",
+        "Value for money, would recommend it to friends.",
+        "Battery drains quickly and charging is slow.",
+        "The phone heats up badly while gaming.",
+        "Software has too many ads and preinstalled apps.",
+        "Build quality feels cheap for the price.",
+        "Speaker is loud but the sound is tinny and harsh."
+    ]
+
+    def get_bestseller_smartphones(self, limit: int = 20) -> List[ProductRecord]:
+        time.sleep(STUB_SCRAPER_DELAY)
+        smartphones = []
+        for rank in range(1, limit + 1):
+            rng = random.Random(rank)
+            smartphones.append(ProductRecord(
+                f"Stub Phone {rank} 5G (8GB RAM, 128GB Storage) - Black",
+                f"{AMAZON_BASE_URL}/dp/B0STUB{rank:04d}",
+                f"₹{rng.randrange(8000, 150000, 1000):,}",
+                round(rng.uniform(3.5, 4.8), 1),
+                rank
+            ))
+        return smartphones
+
+    def get_product_reviews(self, asin: Optional[str], max_reviews: int = 50) -> List[str]:
+        time.sleep(STUB_SCRAPER_DELAY)
+        if not asin:
+            return []
+        rng = random.Random(asin)
+        return [' '.join(rng.sample(self.REVIEW_SENTENCES, 2)) for _ in range(min(max_reviews, rng.randint(10, 30)))]
+
+def create_scraper():
+    """Build the scraper selected by SCRAPER_BACKEND"""
+    if SCRAPER_BACKEND == "stub":
+        return StubScraper()
+    return AmazonScraper()
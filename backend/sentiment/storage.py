@@ -0,0 +1,140 @@
+"""
+Persistent storage of ranked results and per-product scored reviews
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .config import REVIEWS_DIR, SMARTPHONES_FILE
+
+if TYPE_CHECKING:
+    from .schemas import SmartphoneData
+
+logger = logging.getLogger(__name__)
+
+# Persistent storage functions
+def save_smartphones_data(data: List['SmartphoneData']):
+    """Save smartphones data to JSON file"""
+    try:
+        # Convert Pydantic models to dict for JSON serialization
+        data_dict = []
+        for item in data:
+            item_dict = item.dict()
+            # Convert datetime to string for JSON serialization
+            if isinstance(item_dict.get('last_updated'), datetime):
+                item_dict['last_updated'] = item_dict['last_updated'].isoformat()
+            data_dict.append(item_dict)
+
+        # Save to file with timestamp
+        save_data = {
+            "timestamp": datetime.now().isoformat(),
+            "data": data_dict
+        }
+
+        SMARTPHONES_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(SMARTPHONES_FILE, 'w', encoding='utf-8') as f:
+            json.dump(save_data, f, indent=2, ensure_ascii=False)
+
+        logger.info(f"✅ Saved {len(data)} smartphones to {SMARTPHONES_FILE}")
+
+    except Exception as e:
+        logger.error(f"❌ Error saving smartphones data: {e}")
+
+def load_smartphones_data() -> Optional[List['SmartphoneData']]:
+    """Load smartphones data from JSON file"""
+    from .schemas import SmartphoneData
+
+    try:
+        if not SMARTPHONES_FILE.exists():
+            logger.info("No saved smartphones data found")
+            return None
+
+        with open(SMARTPHONES_FILE, 'r', encoding='utf-8') as f:
+            saved_data = json.load(f)
+
+        # Check if data is recent (within 2 hours)
+        saved_timestamp = datetime.fromisoformat(saved_data['timestamp'])
+        if datetime.now() - saved_timestamp > timedelta(hours=2):
+            logger.info("Saved data is too old, will fetch fresh data")
+            return None
+
+        # Convert back to Pydantic models
+        smartphones = []
+        for item_dict in saved_data['data']:
+            # Convert string back to datetime
+            if 'last_updated' in item_dict:
+                item_dict['last_updated'] = datetime.fromisoformat(item_dict['last_updated'])
+            smartphones.append(SmartphoneData(**item_dict))
+
+        logger.info(f"✅ Loaded {len(smartphones)} smartphones from {SMARTPHONES_FILE}")
+        return smartphones
+
+    except Exception as e:
+        logger.error(f"❌ Error loading smartphones data: {e}")
+        return None
+
+# Per-review sentiment buckets
+POSITIVE_REVIEW_THRESHOLD = 0.7
+NEGATIVE_REVIEW_THRESHOLD = 0.3
+
+def sentiment_bucket(score: float) -> str:
+    """Map a POSITIVE probability to a positive/neutral/negative bucket"""
+    if score >= POSITIVE_REVIEW_THRESHOLD:
+        return 'positive'
+    if score <= NEGATIVE_REVIEW_THRESHOLD:
+        return 'negative'
+    return 'neutral'
+
+class ReviewStore:
+    """Scored reviews of each product, one JSON document per canonical product id
+
+    Reviews are stored already bucketed with per-bucket counts, so serving a
+    page is a single file read plus a slice.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def _path(self, asin: str) -> Optional[Path]:
+        if not re.fullmatch(r'[A-Za-z0-9_-]+', asin):
+            return None
+        return self.directory / f"{asin}.json"
+
+    def save(self, asin: str, name: str, reviews: List[str], scores: List[float],
+             duplicate_ratio: Optional[float] = None):
+        path = self._path(asin)
+        if path is None:
+            return
+
+        entries = [{'text': text, 'score': round(score, 4), 'sentiment': sentiment_bucket(score)}
+                   for text, score in zip(reviews, scores)]
+        counts = {bucket: 0 for bucket in ('positive', 'neutral', 'negative')}
+        for entry in entries:
+            counts[entry['sentiment']] += 1
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'asin': asin,
+                'name': name,
+                'timestamp': datetime.now().isoformat(),
+                'counts': counts,
+                'duplicate_ratio': duplicate_ratio,
+                'reviews': entries
+            }, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def load(self, asin: str) -> Optional[Dict]:
+        path = self._path(asin)
+        if path is None or not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+review_store = ReviewStore(REVIEWS_DIR)
@@ -0,0 +1,209 @@
+"""
+Review text cleaning, language and quality filtering, and deduplication
+"""
+
+import hashlib
+import re
+import threading
+from typing import Dict, List, Tuple
+
+from .config import MULTILINGUAL_MODEL_NAME
+
+def clean_text(text: str) -> str:
+    """Clean and normalize text for sentiment analysis"""
+    if not text:
+        return ""
+    
+    # Remove HTML tags
+    text = re.sub(r'<[^>]+>', '', text)
+    # Remove extra whitespace
+    text = re.sub(r'\s+', ' ', text).strip()
+    # Remove special characters but keep basic punctuation and Devanagari vowel signs
+    text = re.sub(r'[^\w\s.,!?\u0900-\u097F-]', '', text)
+    
+    return text[:512]  # Limit to model's max length
+
+# Review language and quality filtering
+# A cheap pre-inference stage: script counts and romanized-Hindi marker words
+# identify the language, and a few rules reject scraped UI text
+_DEVANAGARI_LETTER = re.compile(r'[\u0900-\u097F]')
+_LATIN_LETTER = re.compile(r'[A-Za-z]')
+_WORD = re.compile(r'[a-z]+')
+ENGLISH_MARKERS = frozenset(
+    "the is and it this that to of a an in for with but not very was are have has be my i you on at "
+    "so after its too good bad phone".split()
+)
+HINGLISH_MARKERS = frozenset(
+    "hai hain nahi nahin nhi bahut bohot bhut accha acha achha achchha kya bhi mein ka ki ke ko se "
+    "yeh ye aur lekin tha thi raha rahi kar karta karo bilkul paisa paise bekar bakwas mast sahi "
+    "wala wali kuch sab jaise diya gaya kharab ekdum".split()
+)
+_UI_TEXT_PATTERN = re.compile(
+    r'people found this helpful|person found this helpful|report abuse|verified purchase|reviewed in \w+ on|'
+    r'out of 5 stars|see all reviews|top reviews from|translate review|sign in|add to cart|customer reviews',
+    re.IGNORECASE
+)
+MIN_REVIEW_WORDS = 3
+NON_LATIN_SCRIPT_RATIO = 0.3  # Share of letters in another script above which text is not English
+
+def detect_review_language(text: str) -> str:
+    """Classify text as 'en', 'hi' (Devanagari), 'hinglish' (romanized Hindi) or 'other'"""
+    letters = sum(1 for char in text if char.isalpha())
+    if not letters:
+        return 'other'
+    if len(_DEVANAGARI_LETTER.findall(text)) / letters > NON_LATIN_SCRIPT_RATIO:
+        return 'hi'
+    if 1 - len(_LATIN_LETTER.findall(text)) / letters > NON_LATIN_SCRIPT_RATIO:
+        return 'other'
+
+    words = _WORD.findall(text.lower())
+    english_hits = sum(1 for word in words if word in ENGLISH_MARKERS)
+    hinglish_hits = sum(1 for word in words if word in HINGLISH_MARKERS)
+    if hinglish_hits >= 2 and hinglish_hits > english_hits:
+        return 'hinglish'
+    return 'en'
+
+def looks_like_review(text: str) -> bool:
+    """Reject fragments of page chrome picked up by the fallback extractors"""
+    if len(text.split()) < MIN_REVIEW_WORDS:
+        return False
+    if sum(1 for char in text if char.isalpha()) < len(text.replace(' ', '')) * 0.5:
+        return False
+    return len(_UI_TEXT_PATTERN.findall(text)) < 2
+
+class ReviewFilter:
+    """Pre-inference routing of scraped reviews, with counters of what was filtered"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.inspected = 0
+        self.skipped_not_review = 0
+        self.skipped_non_english = 0
+        self.routed = 0
+        self.languages: Dict[str, int] = {}
+
+    def route(self, reviews: List[str]) -> Tuple[List[str], List[str]]:
+        """Split reviews into English ones and non-English ones for the multilingual model
+
+        Non-reviews are dropped, as are non-English reviews when no multilingual
+        model is configured.
+        """
+        english, routed = [], []
+        not_review = skipped = 0
+        languages: Dict[str, int] = {}
+        for review in reviews:
+            if not looks_like_review(review):
+                not_review += 1
+                continue
+            language = detect_review_language(review)
+            languages[language] = languages.get(language, 0) + 1
+            if language == 'en':
+                english.append(review)
+            elif MULTILINGUAL_MODEL_NAME:
+                routed.append(review)
+            else:
+                skipped += 1
+
+        with self._lock:
+            self.inspected += len(reviews)
+            self.skipped_not_review += not_review
+            self.skipped_non_english += skipped
+            self.routed += len(routed)
+            for language, count in languages.items():
+                self.languages[language] = self.languages.get(language, 0) + count
+        return english, routed
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                'inspected': self.inspected,
+                'skipped_not_review': self.skipped_not_review,
+                'skipped_non_english': self.skipped_non_english,
+                'routed_multilingual': self.routed,
+                'languages': dict(self.languages),
+                'multilingual_model': MULTILINGUAL_MODEL_NAME or None
+            }
+
+review_filter = ReviewFilter()
+
+# Review deduplication configuration
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+MINHASH_ROWS = MINHASH_PERMUTATIONS // MINHASH_BANDS
+NEAR_DUPLICATE_THRESHOLD = 0.8  # Estimated Jaccard similarity above which a review is dropped
+SHINGLE_SIZE = 2
+_MERSENNE_PRIME = (1 << 61) - 1
+_MINHASH_PARAMS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), 'big') % (_MERSENNE_PRIME - 1) + 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), 'big') % _MERSENNE_PRIME)
+    for i in range(MINHASH_PERMUTATIONS)
+]
+
+def _normalize_for_dedup(text: str) -> str:
+    """Lowercase and strip punctuation so trivial variations hash the same"""
+    text = re.sub(r'[^\w\s]', ' ', text.lower())
+    return re.sub(r'\s+', ' ', text).strip()
+
+def _minhash_signature(text: str) -> Tuple[int, ...]:
+    """Compute a MinHash signature over word shingles of normalized text"""
+    words = text.split()
+    if len(words) >= SHINGLE_SIZE:
+        shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    else:
+        shingles = {text}
+
+    hashed = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big') for s in shingles]
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashed) for a, b in _MINHASH_PARAMS)
+
+def deduplicate_reviews(reviews: List[str]) -> Tuple[List[str], Dict]:
+    """Drop exact and near-duplicate reviews before sentiment inference
+
+    Exact duplicates are caught by hashing the normalized text; near-duplicates
+    (nested containers, repeated boilerplate) by MinHash with LSH banding, so
+    each review is only compared against reviews sharing a band.
+    """
+    unique_reviews = []
+    seen_hashes = set()
+    band_index: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+    signatures = []
+    exact_duplicates = 0
+    near_duplicates = 0
+
+    for review in reviews:
+        normalized = _normalize_for_dedup(review)
+        digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+        if digest in seen_hashes:
+            exact_duplicates += 1
+            continue
+        seen_hashes.add(digest)
+
+        signature = _minhash_signature(normalized)
+        bands = [(band, signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]) for band in range(MINHASH_BANDS)]
+
+        candidates = set()
+        for key in bands:
+            candidates.update(band_index.get(key, ()))
+        is_near_duplicate = False
+        for candidate in candidates:
+            matches = sum(x == y for x, y in zip(signature, signatures[candidate]))
+            if matches / MINHASH_PERMUTATIONS >= NEAR_DUPLICATE_THRESHOLD:
+                is_near_duplicate = True
+                break
+        if is_near_duplicate:
+            near_duplicates += 1
+            continue
+
+        position = len(signatures)
+        signatures.append(signature)
+        for key in bands:
+            band_index.setdefault(key, []).append(position)
+        unique_reviews.append(review)
+
+    total = len(reviews)
+    return unique_reviews, {
+        'total': total,
+        'unique': len(unique_reviews),
+        'exact_duplicates': exact_duplicates,
+        'near_duplicates': near_duplicates,
+        'dedup_ratio': round((total - len(unique_reviews)) / total, 4) if total else 0.0
+    }
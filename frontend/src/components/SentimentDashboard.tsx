@@ -13,15 +13,25 @@ import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle, Di
 import { RefreshCw, Smartphone, TrendingUp, Star, MessageCircle, BarChart3, Activity, Eye, ThumbsUp, ThumbsDown } from 'lucide-react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, ResponsiveContainer, PieChart, Pie, Cell, LineChart, Line, Tooltip as RechartsTooltip, Legend } from 'recharts';
 
+interface AspectSentiment {
+  mentions: number;
+  average_sentiment: number;
+  positive_ratio: number;
+}
+
 interface SmartphoneData {
   name: string;
   link: string;
   price?: string;
+  price_value?: number;
+  product_id?: string;
   rating?: number;
   review_count: number;
   average_sentiment: number;
   positive_ratio: number;
   composite_score: number;
+  duplicate_ratio?: number;
+  aspects?: Record<string, AspectSentiment>;
   last_updated: string;
   reviews?: string[];
 }
@@ -43,28 +53,54 @@ export default function SentimentDashboard() {
   const [selectedPhone, setSelectedPhone] = useState<SmartphoneData | null>(null);
   const [reviewsLoading, setReviewsLoading] = useState(false);
   const [reviews, setReviews] = useState<ReviewData[]>([]);
-
-  const fetchData = async () => {
-    try {
-      setError(null);
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
-      const response = await fetch(`${apiUrl}/top-mobiles`);
-      
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-      
-      const result = await response.json();
-      setData(result);
-      setLastUpdated(new Date());
-    } catch (err) {
-      setError(err instanceof Error ? err.message : 'Failed to fetch data');
-      console.error('Error fetching data:', err);
-    } finally {
+  const [streamProgress, setStreamProgress] = useState<{ processed: number; total: number } | null>(null);
+
+  const fetchData = () => new Promise<void>((resolve) => {
+    setError(null);
+    const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+    // Stream products as they are scored instead of waiting for the whole batch
+    const source = new EventSource(`${apiUrl}/top-mobiles/stream`);
+    const streamed: SmartphoneData[] = [];
+
+    const finish = () => {
+      source.close();
+      setStreamProgress(null);
       setLoading(false);
       setRefreshing(false);
-    }
-  };
+      resolve();
+    };
+
+    source.addEventListener('start', (event) => {
+      const { total } = JSON.parse((event as MessageEvent).data);
+      setStreamProgress({ processed: 0, total });
+    });
+
+    source.addEventListener('product', (event) => {
+      streamed.push(JSON.parse((event as MessageEvent).data));
+      setData([...streamed].sort((a, b) => b.composite_score - a.composite_score));
+      setLoading(false);
+    });
+
+    source.addEventListener('progress', (event) => {
+      const { processed, total } = JSON.parse((event as MessageEvent).data);
+      setStreamProgress({ processed, total });
+    });
+
+    source.addEventListener('complete', (event) => {
+      setData(JSON.parse((event as MessageEvent).data));
+      setLastUpdated(new Date());
+      finish();
+    });
+
+    source.addEventListener('error', (event) => {
+      const message = (event as MessageEvent).data
+        ? JSON.parse((event as MessageEvent).data).detail
+        : 'Failed to fetch data';
+      setError(message);
+      console.error('Error fetching data:', message);
+      finish();
+    });
+  });
 
   const handleRefresh = async () => {
     setRefreshing(true);
@@ -85,81 +121,26 @@ export default function SentimentDashboard() {
     setSelectedPhone(phone);
 
     try {
-      // For now, we'll simulate reviews based on the phone's data
-      // In a real implementation, you'd fetch actual reviews from the backend
-      const mockReviews: ReviewData[] = [];
-
-      // Generate mock reviews based on sentiment data
-      const positiveCount = Math.round(phone.review_count * phone.positive_ratio);
-      const negativeCount = Math.round(phone.review_count * (1 - phone.positive_ratio) * 0.3);
-      const neutralCount = phone.review_count - positiveCount - negativeCount;
-
-      // Positive reviews
-      const positiveTemplates = [
-        "Excellent phone with great performance and battery life!",
-        "Amazing camera quality and fast processing speed.",
-        "Best value for money, highly recommended!",
-        "Outstanding build quality and user experience.",
-        "Perfect phone for daily use, very satisfied!",
-        "Great features and smooth performance.",
-        "Impressive display quality and fast charging.",
-        "Reliable phone with excellent customer service."
-      ];
-
-      // Negative reviews
-      const negativeTemplates = [
-        "Battery drains too quickly, not satisfied.",
-        "Camera quality could be better for the price.",
-        "Heating issues during heavy usage.",
-        "Software bugs and slow performance.",
-        "Poor build quality, feels cheap.",
-        "Disappointing performance, expected better.",
-        "Network connectivity issues frequently.",
-        "Not worth the money, many better alternatives."
-      ];
-
-      // Neutral reviews
-      const neutralTemplates = [
-        "Decent phone, nothing extraordinary but works fine.",
-        "Average performance, meets basic requirements.",
-        "Good phone but has some minor issues.",
-        "Okay for the price range, could be improved.",
-        "Standard features, nothing special to highlight.",
-        "Fair performance, some pros and cons.",
-        "Acceptable quality, meets expectations.",
-        "Reasonable choice in this price segment."
-      ];
-
-      // Add positive reviews
-      for (let i = 0; i < Math.min(positiveCount, 12); i++) {
-        mockReviews.push({
-          text: positiveTemplates[i % positiveTemplates.length],
-          sentiment: 'positive',
-          score: 0.7 + Math.random() * 0.3
-        });
+      // Reviews and their scores are stored by the backend when a phone is analyzed
+      const asin = phone.product_id ?? phone.link.split('/dp/')[1]?.split(/[/?]/)[0];
+      if (!asin) {
+        setReviews([]);
+        return;
       }
 
-      // Add negative reviews
-      for (let i = 0; i < Math.min(negativeCount, 8); i++) {
-        mockReviews.push({
-          text: negativeTemplates[i % negativeTemplates.length],
-          sentiment: 'negative',
-          score: 0.1 + Math.random() * 0.3
-        });
-      }
+      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+      const response = await fetch(`${apiUrl}/products/${asin}/reviews?limit=20`);
 
-      // Add neutral reviews
-      for (let i = 0; i < Math.min(neutralCount, 5); i++) {
-        mockReviews.push({
-          text: neutralTemplates[i % neutralTemplates.length],
-          sentiment: 'neutral',
-          score: 0.4 + Math.random() * 0.2
-        });
+      if (response.status === 404) {
+        setReviews([]);
+        return;
+      }
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      // Shuffle and limit to 20 reviews
-      const shuffledReviews = mockReviews.sort(() => Math.random() - 0.5).slice(0, 20);
-      setReviews(shuffledReviews);
+      const result = await response.json();
+      setReviews(result.reviews);
 
     } catch (err) {
       console.error('Error fetching reviews:', err);
@@ -276,6 +257,14 @@ export default function SentimentDashboard() {
                 Last updated: {lastUpdated.toLocaleString()}
               </p>
             )}
+            {streamProgress && (
+              <div className="mt-2 w-64">
+                <p className="text-sm text-gray-500 mb-1">
+                  Analyzing {streamProgress.processed} of {streamProgress.total} smartphones...
+                </p>
+                <Progress value={streamProgress.total ? (streamProgress.processed / streamProgress.total) * 100 : 0} />
+              </div>
+            )}
           </div>
           
           <Button 
@@ -0,0 +1,119 @@
+"""
+Import-time benchmark for the backend entry points
+
+Imports each entry point in fresh interpreters and reports the median
+wall-clock import time, the cumulative self time reported by
+`python -X importtime`, and which heavy dependencies were loaded. Cold start
+matters for the scraper and scorer CLIs and for the API on a sleeping Render
+instance, so each entry point should only pay for what it uses.
+
+Exits non-zero when an entry point exceeds its --max-ms budget or loads a
+dependency it should not.
+
+Usage:
+    python import_benchmark.py
+    python import_benchmark.py --runs 10 --max-ms score_reviews=300 --max-ms app=2000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+HEAVY_MODULES = ["fastapi", "pydantic", "uvicorn", "requests", "bs4", "numpy", "cachetools",
+                 "sortedcontainers", "torch", "transformers", "safetensors"]
+
+# Entry point -> heavy modules it must not load at import time
+ENTRY_POINTS = {
+    "sentiment.scraper": ["fastapi", "pydantic", "numpy", "torch", "transformers", "requests", "bs4"],
+    "sentiment.inference": ["fastapi", "pydantic", "requests", "bs4", "torch", "transformers"],
+    "score_reviews": ["fastapi", "pydantic", "uvicorn", "requests", "bs4", "numpy", "torch", "transformers"],
+    "scrape_bestsellers": ["fastapi", "pydantic", "uvicorn", "numpy", "torch", "transformers", "requests", "bs4"],
+    "app": ["torch", "transformers", "requests", "bs4"],
+}
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{"ms": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure(module: str, importtime: bool = False) -> Tuple[float, List[str], Optional[float]]:
+    """Import a module in a fresh interpreter, returning (ms, heavy modules, importtime self ms)"""
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", PROBE.format(module=module, heavy=HEAVY_MODULES)]
+
+    result = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"))
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    self_ms = None
+    if importtime:
+        # Lines look like "import time:  self [us] | cumulative | imported package"
+        self_ms = sum(int(line.split("|")[0].split(":")[1]) for line in result.stderr.splitlines()
+                      if line.startswith("import time:") and line.split("|")[0].split(":")[1].strip().isdigit()) / 1000
+    return probe["ms"], probe["heavy"], self_ms
+
+def parse_budget(value: str) -> Tuple[str, float]:
+    """Parse MODULE=MS"""
+    try:
+        module, limit = value.split("=", 1)
+        return module, float(limit)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid budget '{value}', expected MODULE=MS")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure import time of the backend entry points")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point")
+    parser.add_argument("--modules", nargs="+", default=list(ENTRY_POINTS), help="Entry points to measure")
+    parser.add_argument("--max-ms", action="append", type=parse_budget, default=[],
+                        help="Median import budget MODULE=MS (repeatable)")
+    args = parser.parse_args(argv)
+    budgets: Dict[str, float] = dict(args.max_ms)
+
+    print(f"🐍 Python {sys.version.split()[0]}, {args.runs} runs per entry point")
+
+    violations = []
+    print("\n" + "=" * 96)
+    print(f"{'Entry point':<22} {'median ms':>10} {'min ms':>8} {'self ms':>8}  Heavy dependencies loaded")
+    print("-" * 96)
+    for module in args.modules:
+        timings = []
+        heavy: List[str] = []
+        for _ in range(args.runs):
+            ms, heavy, _ = measure(module)
+            timings.append(ms)
+        _, _, self_ms = measure(module, importtime=True)
+        median = statistics.median(timings)
+        print(f"{module:<22} {median:>10.1f} {min(timings):>8.1f} {self_ms:>8.1f}  {', '.join(heavy) or '-'}")
+
+        unexpected = [name for name in heavy if name in ENTRY_POINTS.get(module, [])]
+        if unexpected:
+            violations.append(f"{module}: loads {', '.join(unexpected)} at import time")
+        if module in budgets and median > budgets[module]:
+            violations.append(f"{module}: median {median:.1f}ms > {budgets[module]:.0f}ms budget")
+    print("=" * 96)
+
+    if violations:
+        print("\n❌ Import budgets exceeded:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+
+    print("\n🎉 All entry points import within budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
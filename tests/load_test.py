@@ -0,0 +1,291 @@
+"""
+Load test for the Sentiment Analysis API
+
+Drives concurrent clients against the API in three states and reports
+throughput and latency percentiles per endpoint:
+
+  cold         no cached results; /top-mobiles requests wait on the first refresh
+  warm         results cached
+  mid-refresh  a refresh job is running
+
+Exits non-zero when a latency budget or the error budget is exceeded. With
+--spawn the API is started locally with the stub scraper (SCRAPER_BACKEND=stub)
+and the stub sentiment scorer (SENTIMENT_BACKEND=stub) in a throwaway data
+directory, so the test runs offline. --real-model loads DistilBERT instead,
+which needs built artifacts in MODEL_CACHE_DIR or access to the Hugging Face hub.
+
+Usage:
+    python load_test.py --spawn
+    python load_test.py --base-url http://localhost:8001 --concurrency 50 --requests 500
+    python load_test.py --spawn --budget warm:/top-mobiles:p99=100
+    python load_test.py --spawn --real-model
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+BACKEND_DIR = REPO_DIR / "backend"
+
+ENDPOINTS = ["/health", "/storage-status", "/top-mobiles"]
+STATES = ["cold", "warm", "mid-refresh"]
+
+# Latency budgets in milliseconds: state -> endpoint -> percentile -> limit
+DEFAULT_BUDGETS = {
+    "cold": {
+        "/health": {"p95": 250},
+        "/storage-status": {"p95": 250},
+    },
+    "warm": {
+        "/health": {"p95": 150, "p99": 250},
+        "/storage-status": {"p95": 150, "p99": 250},
+        "/top-mobiles": {"p95": 150, "p99": 300},
+    },
+    "mid-refresh": {
+        "/health": {"p95": 250},
+        "/storage-status": {"p95": 250},
+    },
+}
+
+def percentile(latencies: List[float], p: float) -> Optional[float]:
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+def parse_budget(value: str) -> Tuple[str, str, str, float]:
+    """Parse STATE:ENDPOINT:pNN=MS"""
+    try:
+        target, limit = value.split("=", 1)
+        state, endpoint, pct = target.split(":", 2)
+        if state not in STATES or not pct.startswith("p"):
+            raise ValueError
+        float(pct[1:])
+        return state, endpoint, pct, float(limit)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid budget '{value}', expected STATE:ENDPOINT:pNN=MS")
+
+class PhaseResult:
+    """Latencies and failures recorded for one load phase"""
+
+    def __init__(self, state: str):
+        self.state = state
+        self.latencies: Dict[str, List[float]] = {endpoint: [] for endpoint in ENDPOINTS}
+        self.errors: Dict[str, int] = {endpoint: 0 for endpoint in ENDPOINTS}
+        self.elapsed = 0.0
+        self.note = ""
+
+    def record(self, endpoint: str, latency_ms: float, ok: bool):
+        self.latencies[endpoint].append(latency_ms)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def summary(self, endpoint: str) -> Dict:
+        latencies = self.latencies[endpoint]
+        return {
+            "requests": len(latencies),
+            "errors": self.errors[endpoint],
+            "rps": len(latencies) / self.elapsed if self.elapsed else 0.0,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+        }
+
+async def run_phase(client: httpx.AsyncClient, state: str, concurrency: int, total_requests: int,
+                    timeout: float) -> PhaseResult:
+    """Spread requests round-robin over the endpoints across concurrent clients"""
+    result = PhaseResult(state)
+    next_request = 0
+
+    async def worker():
+        nonlocal next_request
+        while next_request < total_requests:
+            endpoint = ENDPOINTS[next_request % len(ENDPOINTS)]
+            next_request += 1
+            started = time.perf_counter()
+            try:
+                response = await client.get(endpoint, timeout=timeout)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            result.record(endpoint, (time.perf_counter() - started) * 1000, ok)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+async def wait_for_job(client: httpx.AsyncClient, status_url: str, timeout: float) -> str:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = (await client.get(status_url)).json()["status"]
+        if status in ("completed", "failed"):
+            return status
+        await asyncio.sleep(0.5)
+    return "timeout"
+
+async def start_refresh(client: httpx.AsyncClient) -> str:
+    """Clear cached results and start a refresh job, returning its status URL"""
+    response = await client.post("/refresh")
+    response.raise_for_status()
+    return response.json()["status_url"]
+
+async def run_load_test(args) -> List[PhaseResult]:
+    results = []
+    async with httpx.AsyncClient(base_url=args.base_url, limits=httpx.Limits(max_connections=args.concurrency)) as client:
+        for state in args.states:
+            status_url = None
+            if state in ("cold", "mid-refresh"):
+                status_url = await start_refresh(client)
+                if state == "mid-refresh":
+                    # Let the job get past scraping so load overlaps scoring
+                    await asyncio.sleep(args.refresh_lead)
+            elif not results:
+                # Populate caches on a server in an unknown state
+                await client.get("/top-mobiles", timeout=args.timeout)
+
+            print(f"\n▶️  {state}: {args.requests} requests, {args.concurrency} concurrent clients")
+            result = await run_phase(client, state, args.concurrency, args.requests, args.timeout)
+
+            if status_url:
+                job = (await client.get(status_url)).json()
+                if state == "mid-refresh" and job["status"] != "running":
+                    result.note = "refresh finished before the phase ended; raise --stub-delay or lower --requests"
+                job_status = await wait_for_job(client, status_url, args.timeout)
+                if job_status != "completed":
+                    result.note = f"refresh job {job_status}"
+            results.append(result)
+    return results
+
+def check_budgets(results: List[PhaseResult], budgets: Dict, max_error_rate: float) -> List[str]:
+    violations = []
+    for result in results:
+        for endpoint in ENDPOINTS:
+            summary = result.summary(endpoint)
+            if summary["requests"] and summary["errors"] / summary["requests"] > max_error_rate:
+                violations.append(f"{result.state} {endpoint}: {summary['errors']}/{summary['requests']} requests failed")
+            for pct, limit in budgets.get(result.state, {}).get(endpoint, {}).items():
+                observed = percentile(result.latencies[endpoint], float(pct[1:]))
+                if observed is not None and observed > limit:
+                    violations.append(f"{result.state} {endpoint}: {pct} {observed:.1f}ms > {limit:.0f}ms budget")
+    return violations
+
+def print_report(results: List[PhaseResult]):
+    def fmt(value: Optional[float]) -> str:
+        return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+
+    print("\n" + "=" * 84)
+    print(f"{'State':<12} {'Endpoint':<16} {'Reqs':>6} {'Errors':>6} {'Req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print("-" * 84)
+    for result in results:
+        for endpoint in ENDPOINTS:
+            s = result.summary(endpoint)
+            print(f"{result.state:<12} {endpoint:<16} {s['requests']:>6} {s['errors']:>6} {s['rps']:>8.1f} "
+                  f"{fmt(s['p50'])} {fmt(s['p95'])} {fmt(s['p99'])}")
+        if result.note:
+            print(f"{'':<12} ⚠️  {result.note}")
+    print("=" * 84)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def spawn_server(args) -> Tuple[subprocess.Popen, Path]:
+    """Start the API with the stub scraper, storing data in a temporary directory"""
+    work_dir = Path(tempfile.mkdtemp(prefix="sentiment-load-"))
+    run_dir = work_dir / "run"  # The API keeps its data in ../data
+    run_dir.mkdir()
+
+    port = free_port()
+    args.base_url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, SCRAPER_BACKEND="stub", STUB_SCRAPER_DELAY=str(args.stub_delay),
+               SENTIMENT_BACKEND="model" if args.real_model else "stub")
+    # Share the model artifacts instead of rebuilding them in the throwaway directory
+    env.setdefault("MODEL_CACHE_DIR", str(REPO_DIR / "data" / "model_cache"))
+    if args.real_model:
+        print(f"ℹ️  Loading the real model from {env['MODEL_CACHE_DIR']} (downloaded from the hub if missing)")
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--app-dir", str(BACKEND_DIR),
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=run_dir, env=env
+    )
+
+    deadline = time.time() + args.startup_timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"API exited during startup with code {server.returncode}")
+        try:
+            if httpx.get(f"{args.base_url}/health", timeout=2).status_code == 200:
+                print(f"✅ API started at {args.base_url} (data in {work_dir / 'data'})")
+                return server, work_dir
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+
+    server.terminate()
+    raise RuntimeError("API did not become healthy in time")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the API and enforce latency budgets")
+    parser.add_argument("--base-url", default="http://localhost:8001", help="API to test (ignored with --spawn)")
+    parser.add_argument("--spawn", action="store_true", help="Start a local API with the stub scraper")
+    parser.add_argument("--stub-delay", type=float, default=0.2, help="Simulated seconds per stub page fetch")
+    parser.add_argument("--real-model", action="store_true",
+                        help="Score with the real model in a spawned API instead of the stub scorer")
+    parser.add_argument("--startup-timeout", type=float, default=300, help="Seconds to wait for a spawned API")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per state, spread over the endpoints")
+    parser.add_argument("--states", nargs="+", choices=STATES, default=STATES, help="States to test, in order")
+    parser.add_argument("--refresh-lead", type=float, default=1.0,
+                        help="Seconds between starting a refresh and the mid-refresh phase")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-request timeout in seconds")
+    parser.add_argument("--budget", action="append", type=parse_budget, default=[],
+                        help="Latency budget STATE:ENDPOINT:pNN=MS, overriding the defaults (repeatable)")
+    parser.add_argument("--no-default-budgets", action="store_true", help="Only enforce budgets given with --budget")
+    parser.add_argument("--max-error-rate", type=float, default=0.0, help="Allowed share of failed requests")
+    args = parser.parse_args(argv)
+
+    budgets = {} if args.no_default_budgets else {state: {endpoint: dict(limits) for endpoint, limits in endpoints.items()}
+                                                  for state, endpoints in DEFAULT_BUDGETS.items()}
+    for state, endpoint, pct, limit in args.budget:
+        budgets.setdefault(state, {}).setdefault(endpoint, {})[pct] = limit
+
+    server = work_dir = None
+    if args.spawn:
+        server, work_dir = spawn_server(args)
+
+    try:
+        print(f"🚀 Load testing {args.base_url}")
+        results = asyncio.run(run_load_test(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_report(results)
+    violations = check_budgets(results, budgets, args.max_error_rate)
+    if violations:
+        print("\n❌ Budgets exceeded:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+
+    print("\n🎉 All latency budgets met")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ Test script for the Sentiment Analysis API
 import requests
 import json
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 
 BASE_URL = "http://localhost:8001"
 
@@ -68,6 +68,75 @@ def test_top_mobiles_endpoint():
         print(f"❌ Top mobiles endpoint failed: {e}")
         return False
 
+def test_ranking_formulas():
+    """Test ranking by an alternate scoring formula"""
+    print("\n🔍 Testing ranking formulas...")
+    try:
+        formulas = requests.get(f"{BASE_URL}/rankings/formulas", timeout=10).json()
+        print(f"Formulas: {[formula['name'] for formula in formulas]}")
+
+        response = requests.get(f"{BASE_URL}/top-mobiles", params={"formula": "bayesian"}, timeout=300)
+        print(f"Status: {response.status_code}")
+        if response.status_code != 200:
+            return False
+
+        scores = [phone["composite_score"] for phone in response.json()]
+        if scores != sorted(scores, reverse=True):
+            print("❌ Alternate ranking is not ordered by its score")
+            return False
+
+        unknown = requests.get(f"{BASE_URL}/top-mobiles", params={"formula": "unknown"}, timeout=10)
+        return unknown.status_code == 400
+    except Exception as e:
+        print(f"❌ Ranking formulas failed: {e}")
+        return False
+
+def test_top_mobiles_stream_endpoint():
+    """Test the streaming top mobiles endpoint"""
+    print("\n🔍 Testing top-mobiles/stream endpoint...")
+
+    start_time = time.time()
+    first_product_time = None
+    events = {}
+    try:
+        with requests.get(f"{BASE_URL}/top-mobiles/stream", stream=True, timeout=300) as response:
+            print(f"Status: {response.status_code}")
+            event_name = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event: "):
+                    event_name = line[len("event: "):]
+                    events[event_name] = events.get(event_name, 0) + 1
+                    if event_name == "product" and first_product_time is None:
+                        first_product_time = time.time()
+                elif line.startswith("data: ") and event_name == "error":
+                    print(f"❌ Error event: {line[len('data: '):]}")
+                    return False
+                if event_name == "complete":
+                    break
+
+        print(f"Events received: {events}")
+        if first_product_time:
+            print(f"Time to first product: {first_product_time - start_time:.2f} seconds")
+        print(f"Total time: {time.time() - start_time:.2f} seconds")
+        return response.status_code == 200 and events.get("complete") == 1
+
+    except Exception as e:
+        print(f"❌ Top mobiles stream endpoint failed: {e}")
+        return False
+
+def test_analyze_endpoint():
+    """Test the ad-hoc analyze endpoint"""
+    print("\n🔍 Testing analyze endpoint...")
+    try:
+        payload = {"texts": ["Amazing camera and battery life!", "Terrible phone, stopped working in a week."]}
+        response = requests.post(f"{BASE_URL}/analyze", json=payload, timeout=60)
+        print(f"Status: {response.status_code}")
+        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        return response.status_code == 200 and len(response.json()["results"]) == 2
+    except Exception as e:
+        print(f"❌ Analyze endpoint failed: {e}")
+        return False
+
 def test_refresh_endpoint():
     """Test the refresh endpoint"""
     print("\n🔍 Testing refresh endpoint...")
@@ -75,11 +144,92 @@ def test_refresh_endpoint():
         response = requests.post(f"{BASE_URL}/refresh", timeout=30)
         print(f"Status: {response.status_code}")
         print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
+        if response.status_code != 200:
+            return False
+
+        # A second refresh while the first is running should join the same job
+        duplicate = requests.post(f"{BASE_URL}/refresh", timeout=30).json()
+        if duplicate.get("job_id") != response.json().get("job_id"):
+            print("❌ Duplicate refresh started a new job")
+            return False
+
+        job_response = requests.get(f"{BASE_URL}{response.json()['status_url']}", timeout=10)
+        print(f"Job status: {json.dumps(job_response.json(), indent=2)}")
+        return job_response.status_code == 200
     except Exception as e:
         print(f"❌ Refresh endpoint failed: {e}")
         return False
 
+def test_product_reviews_endpoint():
+    """Test the stored reviews endpoint, its sentiment filter and an unknown product"""
+    print("\n🔍 Testing product reviews endpoint...")
+    try:
+        phones = requests.get(f"{BASE_URL}/top-mobiles", timeout=300).json()
+        if not phones:
+            print("❌ No products to query reviews for")
+            return False
+        asin = phones[0]["product_id"]
+
+        response = requests.get(f"{BASE_URL}/products/{asin}/reviews", params={"limit": 5}, timeout=10)
+        print(f"Status: {response.status_code}")
+        if response.status_code != 200:
+            return False
+        page = response.json()
+        print(f"Stored reviews for {asin}: {page['total']} ({page['counts']})")
+        if len(page["reviews"]) > 5 or page["total"] != sum(page["counts"].values()):
+            print("❌ Page or counts inconsistent")
+            return False
+
+        positive = requests.get(f"{BASE_URL}/products/{asin}/reviews", params={"sentiment": "positive"},
+                                timeout=10).json()
+        if positive["total"] != page["counts"]["positive"] or \
+                any(review["sentiment"] != "positive" for review in positive["reviews"]):
+            print("❌ Sentiment filter ignored")
+            return False
+
+        unknown = requests.get(f"{BASE_URL}/products/B000000000/reviews", timeout=10)
+        print(f"Unknown product status: {unknown.status_code}")
+        return unknown.status_code == 404
+    except Exception as e:
+        print(f"❌ Product reviews endpoint failed: {e}")
+        return False
+
+def test_history_endpoint():
+    """Test the history endpoint with a date range and an unknown product"""
+    print("\n🔍 Testing history endpoint...")
+    try:
+        phones = requests.get(f"{BASE_URL}/top-mobiles", timeout=300).json()
+        if not phones:
+            print("❌ No products to query history for")
+            return False
+        asin = phones[0]["product_id"]
+
+        response = requests.get(f"{BASE_URL}/history/{asin}", timeout=10)
+        print(f"Status: {response.status_code}")
+        points = response.json()["points"]
+        print(f"History points for {asin}: {len(points)}")
+        if response.status_code != 200 or not points:
+            return False
+
+        # A range ending before the first snapshot is empty; one spanning all snapshots returns them all
+        first = datetime.fromisoformat(points[0]["timestamp"])
+        last = datetime.fromisoformat(points[-1]["timestamp"])
+        before = requests.get(f"{BASE_URL}/history/{asin}", timeout=10,
+                              params={"end": (first - timedelta(days=1)).isoformat()}).json()["points"]
+        covering = requests.get(f"{BASE_URL}/history/{asin}", timeout=10,
+                                params={"start": (first - timedelta(seconds=1)).isoformat(),
+                                        "end": (last + timedelta(seconds=1)).isoformat()}).json()["points"]
+        if before or len(covering) != len(points):
+            print(f"❌ Date range ignored: {len(before)} points before, {len(covering)} in range")
+            return False
+
+        unknown = requests.get(f"{BASE_URL}/history/B000000000", timeout=10)
+        print(f"Unknown product status: {unknown.status_code}")
+        return unknown.status_code == 200 and unknown.json()["points"] == []
+    except Exception as e:
+        print(f"❌ History endpoint failed: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🚀 Starting API tests...")
@@ -89,8 +239,13 @@ def main():
     tests = [
         ("Health Check", test_health_endpoint),
         ("Root Endpoint", test_root_endpoint),
+        ("Analyze Endpoint", test_analyze_endpoint),
         ("Refresh Endpoint", test_refresh_endpoint),
         ("Top Mobiles Endpoint", test_top_mobiles_endpoint),
+        ("Top Mobiles Stream Endpoint", test_top_mobiles_stream_endpoint),
+        ("Ranking Formulas", test_ranking_formulas),
+        ("Product Reviews Endpoint", test_product_reviews_endpoint),
+        ("History Endpoint", test_history_endpoint),
     ]
     
     results = {}
@@ -0,0 +1,557 @@
+"""
+Deterministic checks of the pipeline's logic and storage
+
+Runs offline without the model or a server; inference checks use a stub pipeline
+and data is written to a temporary directory.
+
+Usage:
+    python test_pipeline_logic.py
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+# The backend keeps its data in ../data relative to the working directory
+WORK_DIR = Path(tempfile.mkdtemp(prefix="sentiment-logic-"))
+(WORK_DIR / "run").mkdir()
+os.chdir(WORK_DIR / "run")
+# Keep the CLIs exercised below from logging every chunk
+logging.basicConfig(level=logging.WARNING)
+
+import score_reviews
+from sentiment import inference
+from sentiment.history import SentimentHistoryStore
+from sentiment.identity import ProductIdentityIndex, extract_asin, product_model_key
+from sentiment.records import ProductRecord, ScoredProduct, parse_price
+from sentiment import text as text_module
+from sentiment.scoring import SCORING_FORMULAS, RankingIndex, score_smartphone
+from sentiment.storage import ReviewStore
+from sentiment.text import (
+    NEAR_DUPLICATE_THRESHOLD, _minhash_signature, _normalize_for_dedup, deduplicate_reviews,
+    detect_review_language, looks_like_review
+)
+
+def check(condition: bool, message: str):
+    if not condition:
+        raise AssertionError(message)
+
+def minhash_similarity(a: str, b: str) -> float:
+    sig_a = _minhash_signature(_normalize_for_dedup(a))
+    sig_b = _minhash_signature(_normalize_for_dedup(b))
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+def test_deduplication():
+    """Exact and near duplicates are dropped, distinct reviews kept"""
+    base = "The battery easily lasts two days and the camera takes sharp photos in daylight"
+    reviews = [
+        base,
+        base.upper() + "!!",  # Exact after normalization
+        base + " overall",  # Near duplicate
+        "Display is dim outdoors and the speaker distorts at high volume",
+        "Display is bright outdoors and the speaker stays clear at high volume",
+    ]
+    unique, stats = deduplicate_reviews(reviews)
+    check(unique == [reviews[0], reviews[3], reviews[4]], f"unexpected survivors: {unique}")
+    check(stats['total'] == 5 and stats['unique'] == 3, f"unexpected stats: {stats}")
+    check(abs(stats['dedup_ratio'] - 0.4) < 1e-9, f"unexpected dedup ratio: {stats['dedup_ratio']}")
+
+    # Signatures are deterministic, and the threshold separates the pairs above
+    check(_minhash_signature("same text here") == _minhash_signature("same text here"), "signature is not stable")
+    check(minhash_similarity(base, base + " overall") >= NEAR_DUPLICATE_THRESHOLD, "near duplicate below threshold")
+    check(minhash_similarity(reviews[3], reviews[4]) < NEAR_DUPLICATE_THRESHOLD, "distinct reviews above threshold")
+    check(deduplicate_reviews([])[0] == [] and deduplicate_reviews([])[1]['dedup_ratio'] == 0.0,
+          "empty input should yield no reviews")
+    print("✅ deduplication")
+    return True
+
+def test_language_and_review_filter():
+    """Language routing and rejection of page text"""
+    cases = {
+        "The camera is great and the battery lasts all day": 'en',
+        "यह फोन बहुत अच्छा है और बैटरी भी अच्छी है": 'hi',
+        "phone bahut accha hai lekin battery jaldi khatam ho jati hai": 'hinglish',
+        "这款手机的电池续航很好": 'other',
+        "12345 !!!": 'other',
+    }
+    for text, expected in cases.items():
+        language = detect_review_language(text)
+        check(language == expected, f"{text!r}: expected {expected}, got {language}")
+
+    check(looks_like_review("Battery life is excellent and charging is fast"), "real review rejected")
+    check(not looks_like_review("Great phone"), "two-word fragment accepted")
+    check(not looks_like_review("★★★★★ 4.5 out of 5 ★★★★"), "symbol-heavy text accepted")
+    check(not looks_like_review("Verified Purchase 25 people found this helpful Report"), "page text accepted")
+    print("✅ language and review filter")
+    return True
+
+def test_product_identity():
+    """ASIN extraction and title-based variant grouping"""
+    check(extract_asin("https://www.amazon.in/Apple-iPhone-15/dp/b0cHX1w1xy/ref=sr_1_1?th=1") == "B0CHX1W1XY",
+          "ASIN not extracted from /dp/ link")
+    check(extract_asin("https://www.amazon.in/gp/product/B0CHX1W1XY") == "B0CHX1W1XY",
+          "ASIN not extracted from /gp/product/ link")
+    check(extract_asin("https://www.amazon.in/dp/B0CHX1W1XYZ") is None, "11-character id accepted as ASIN")
+    check(extract_asin("") is None, "empty link should have no ASIN")
+
+    # Colour and storage variants share a model key; different models do not
+    check(product_model_key("Apple iPhone 15 (128 GB) - Black") == "apple iphone 15", "iPhone key")
+    check(product_model_key("Apple iPhone 15 (256 GB) - Blue") == "apple iphone 15", "iPhone variant key")
+    check(product_model_key("Apple iPhone 15 Plus (128 GB) - Black") != "apple iphone 15", "Plus merged with base")
+    check(product_model_key("Redmi 13C 5G (Starlight Black, 4GB RAM, 128GB Storage)") !=
+          product_model_key("Redmi 13C (Starlight Black, 4GB RAM, 128GB Storage)"), "5G and 4G models merged")
+    # A separator right after the brand must not reduce the key to the brand
+    check(product_model_key("Samsung | Galaxy M14 5G (Blue)") == "samsung galaxy m14 5g", "brand-only key")
+    check(product_model_key("Apple - iPhone 13") == "apple iphone 13", "brand-only key")
+    check(product_model_key("Samsung | Smartphone") == "", "title without a model number got a key")
+    # Bracketed model numbers are kept and network words are not model numbers
+    nothing = ["Nothing Phone (2a) 5G (Black, 8GB RAM, 128GB Storage)",
+               "Nothing Phone (3a) 5G (Black, 8GB RAM, 128GB Storage)",
+               "Nothing Phone (2)"]
+    keys = [product_model_key(title) for title in nothing]
+    check(keys == ["nothing phone 2a 5g", "nothing phone 3a 5g", "nothing phone 2"], f"bracketed models merged: {keys}")
+    check(product_model_key("Nothing Phone (2a) 5G (Blue, 12GB RAM, 256GB Storage)") == "nothing phone 2a 5g",
+          "bracketed colour and storage kept")
+    check(product_model_key("Samsung Galaxy 5G Smartphone") == "", "network word taken as the model number")
+    # Renewed and refurbished listings are kept apart from new ones
+    check(product_model_key("Apple iPhone 13 (128GB) - Midnight (Renewed)") == "apple iphone 13 renewed", "renewed key")
+    check(product_model_key("Apple iPhone 13 (256GB) - Blue (Refurbished)") == "apple iphone 13 renewed",
+          "refurbished key")
+    check(product_model_key("Apple iPhone 13 (128GB) - Midnight") == "apple iphone 13", "new listing key")
+
+    index = ProductIdentityIndex(WORK_DIR / "product_index.json")
+    base = index.resolve("B0AAAAAAA1", "Samsung Galaxy M34 5G (Midnight Blue, 6GB, 128GB Storage)")
+    variant = index.resolve("B0AAAAAAA2", "Samsung Galaxy M34 5G (Prism Silver, 8GB, 128GB Storage)")
+    other = index.resolve("B0AAAAAAA3", "Samsung Galaxy M35 5G (Daybreak Blue, 6GB, 128GB Storage)")
+    check(base == variant == "B0AAAAAAA1", "colour variant not grouped")
+    check(other == "B0AAAAAAA3", "different model grouped into another product")
+    check(index.resolve("B0AAAAAAA4", "Samsung | Smartphone") == "B0AAAAAAA4" and
+          index.resolve("B0AAAAAAA5", "Samsung | Smartphone") == "B0AAAAAAA5", "ambiguous titles grouped")
+    check(index.variants(base) == ["B0AAAAAAA1", "B0AAAAAAA2"], f"unexpected variants: {index.variants(base)}")
+    check(index.canonical_id("b0aaaaaaa2") == base, "lowercase ASIN not mapped")
+
+    check(index.resolve("B0AAAAAAA6", "Samsung Galaxy M34 5G (Midnight Blue, 6GB, 128GB Storage) (Renewed)") ==
+          "B0AAAAAAA6", "renewed listing grouped with new ones")
+
+    # Persisted ids survive a reload
+    reloaded = ProductIdentityIndex(WORK_DIR / "product_index.json")
+    check(reloaded.canonical_id("B0AAAAAAA2") == base and len(reloaded) == 5, "index did not round-trip")
+    check(reloaded.regroup() == 0 and reloaded.canonical_id("B0AAAAAAA2") == base, "regroup moved a correct grouping")
+
+    # An index grouped by an older model key is regrouped on load; variants without a title are dropped
+    with open(WORK_DIR / "stale_index.json", "w", encoding="utf-8") as f:
+        json.dump({
+            'asins': {"B0NOTHING1": "B0NOTHING1", "B0NOTHING2": "B0NOTHING1", "B0NOTHING3": "B0NOTHING1"},
+            'models': {"nothing phone 5g": "B0NOTHING1"},
+            'products': {"B0NOTHING1": {'name': nothing[0], 'model': "nothing phone 5g",
+                                        'variants': ["B0NOTHING1", "B0NOTHING2", "B0NOTHING3"]}}
+        }, f)
+    stale = ProductIdentityIndex(WORK_DIR / "stale_index.json")
+    check(stale.variants("B0NOTHING1") == ["B0NOTHING1"], f"stale grouping kept: {stale.variants('B0NOTHING1')}")
+    check(stale.canonical_id("B0NOTHING2") == "B0NOTHING2", "dropped variant still mapped")
+    check(stale.resolve("B0NOTHING2", nothing[1]) == "B0NOTHING2" and stale.resolve("B0NOTHING3", nothing[2]) ==
+          "B0NOTHING3", "re-registered variants grouped with another model")
+    regrouped = ProductIdentityIndex(WORK_DIR / "stale_index.json")
+    check(len(regrouped) == 3 and regrouped.canonical_id("B0NOTHING3") == "B0NOTHING3", "regrouped index not saved")
+    print("✅ product identity")
+    return True
+
+def test_parse_price():
+    """Display prices with currency symbols and Indian digit grouping"""
+    cases = {"₹1,34,900": 134900.0, "₹9,999.00": 9999.0, "Rs. 12,499": 12499.0, "": None, None: None, "N/A": None}
+    for text, expected in cases.items():
+        check(parse_price(text) == expected, f"{text!r}: expected {expected}, got {parse_price(text)}")
+    print("✅ price parsing")
+    return True
+
+def make_scored(asin: str, rank: int, positive_ratio: float, review_count: int) -> ScoredProduct:
+    product = ProductRecord(f"Test Phone {asin}", f"https://www.amazon.in/dp/{asin}", "₹9,999", 4.0, rank)
+    return ScoredProduct(product, review_count, positive_ratio, positive_ratio, 0.0, None, None)
+
+def test_ranking_index():
+    """Ordering per formula, replacement and agreement with the formulas"""
+    index = RankingIndex()
+    popular = make_scored("B0RANK0001", 1, 0.60, 200)
+    loved = make_scored("B0RANK0002", 8, 0.95, 3)
+    index.update(popular)
+    index.update(loved)
+
+    for name, formula in SCORING_FORMULAS.items():
+        ranked = index.top(name)
+        expected = sorted([popular, loved], reverse=True,
+                          key=lambda s: formula.score(s.product.rank, s.positive_ratio, s.review_count))
+        check([s.product.product_id for s, _ in ranked] == [s.product.product_id for s in expected],
+              f"{name}: wrong order")
+        check(all(abs(score - formula.score(s.product.rank, s.positive_ratio, s.review_count)) < 1e-9
+                  for s, score in ranked), f"{name}: scores differ from the formula")
+
+    check(index.top("sentiment")[0][0] is loved and index.top("popularity")[0][0] is popular,
+          "sentiment and popularity should disagree on the leader")
+    # The Bayesian prior pulls a 3-review product towards the mean
+    check(index.top("bayesian")[0][0] is popular, "bayesian prior did not discount few reviews")
+
+    # Rescoring replaces the earlier entry instead of duplicating it
+    index.update(make_scored("B0RANK0002", 8, 0.10, 3))
+    check(len(index) == 2 and index.top("sentiment")[0][0] is popular, "update did not replace the entry")
+    index.remove("B0RANK0001")
+    check([s.product.product_id for s, _ in index.top("default")] == ["B0RANK0002"], "remove left the entry")
+    check(index.top("default", k=0) == [], "k=0 should return nothing")
+    print("✅ ranking index")
+    return True
+
+def test_history_round_trip():
+    """Snapshots read back per product, oldest first, with unknowns preserved"""
+    store = SentimentHistoryStore(WORK_DIR / "history")
+    first = datetime(2026, 1, 1, 12, 0)
+    rows = [ScoredProduct.to_model(make_scored("B0HIST0001", 1, 0.8, 40)),
+            ScoredProduct.to_model(make_scored("B0HIST0002", 2, 0.6, 10))]
+    rows[1].rating = None
+    rows[1].review_count = None
+    store.append_snapshot(rows, timestamp=first)
+    rows[0].positive_ratio = 0.7
+    store.append_snapshot(rows, timestamp=first + timedelta(days=1))
+
+    check(len(store) == 4, f"expected 4 rows, got {len(store)}")
+    points = store.query("B0HIST0001")
+    check([p.timestamp for p in points] == [first, first + timedelta(days=1)], "points out of order")
+    check([p.positive_ratio for p in points] == [0.8, 0.7], f"ratios did not round-trip: {points}")
+    check(points[0].rank == 1 and points[0].review_count == 40 and points[0].rating == 4.0, "fields did not round-trip")
+
+    other = store.query("B0HIST0002")
+    check(other[0].rating is None and other[0].review_count is None, "unknown values not preserved")
+    check(len(store.query("B0HIST0001", start=first + timedelta(hours=1))) == 1, "start filter ignored")
+    check(len(store.query("B0HIST0001", limit=1)) == 1 and store.query("B0HIST0001", limit=1)[0].positive_ratio == 0.7,
+          "limit should keep the most recent point")
+    check(store.query("B0MISSING0") == [], "unknown product returned points")
+    print("✅ history round trip")
+    return True
+
+def test_review_store_round_trip():
+    """Stored reviews read back with their scores, buckets and counts"""
+    store = ReviewStore(WORK_DIR / "reviews")
+    texts = ["Brilliant battery and camera", "Average phone for the price", "Screen died within a week"]
+    store.save("B0STORE001", "Test Phone", texts, [0.91234, 0.5, 0.1], duplicate_ratio=0.25)
+
+    stored = store.load("B0STORE001")
+    check(stored['asin'] == "B0STORE001" and stored['name'] == "Test Phone", f"identity did not round-trip: {stored}")
+    check([review['text'] for review in stored['reviews']] == texts, "texts did not round-trip")
+    check([review['score'] for review in stored['reviews']] == [0.9123, 0.5, 0.1], "scores not rounded to 4 places")
+    check([review['sentiment'] for review in stored['reviews']] == ['positive', 'neutral', 'negative'], "wrong buckets")
+    check(stored['counts'] == {'positive': 1, 'neutral': 1, 'negative': 1}, f"wrong counts: {stored['counts']}")
+    check(stored['duplicate_ratio'] == 0.25 and stored['timestamp'], "metadata did not round-trip")
+
+    # A rescore replaces the stored document; unknown and unsafe ids have none
+    store.save("B0STORE001", "Test Phone", texts[:1], [0.2])
+    check(store.load("B0STORE001")['counts'] == {'positive': 0, 'neutral': 0, 'negative': 1}, "rescore not stored")
+    check(store.load("B0MISSING0") is None, "unknown product returned reviews")
+    check(store.load("../B0STORE001") is None, "path traversal accepted")
+    print("✅ review store round trip")
+    return True
+
+def test_score_reviews_resume():
+    """An interrupted bulk scoring run resumes to the same output as an uninterrupted one"""
+    inference.sentiment_pipeline = inference.StubSentimentPipeline()
+    reviews = WORK_DIR / "reviews.jsonl"
+    with open(reviews, 'w', encoding='utf-8') as f:
+        for i in range(10):
+            text = "" if i == 4 else f"{'Great' if i % 3 else 'Terrible'} phone, review number {i}"
+            f.write(json.dumps({"asin": f"B0BULK000{i % 2}", "rank": i % 2 + 1, "text": text, "stars": i}) + "\n")
+
+    def run(output: str, *extra: str) -> int:
+        return score_reviews.main([str(reviews), str(WORK_DIR / output), "--workers", "1", "--chunk-size", "3",
+                                   "--rank-field", "rank", "--summary", str(WORK_DIR / f"{output}.summary"), *extra])
+
+    check(run("full.jsonl") == 0, "uninterrupted run failed")
+
+    # Interrupt while scoring the third chunk, after two chunks were checkpointed
+    score_texts = score_reviews.score_texts
+    calls = []
+    def interrupted(texts):
+        calls.append(texts)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return score_texts(texts)
+    score_reviews.score_texts = interrupted
+    try:
+        run("resumed.jsonl")
+        check(False, "interrupted run completed")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        score_reviews.score_texts = score_texts
+
+    checkpoint = score_reviews.Checkpoint(WORK_DIR / "resumed.jsonl.checkpoint")
+    check(checkpoint.load() and checkpoint.rows_done == 6, f"unexpected checkpoint: {checkpoint.rows_done} rows")
+    check(run("resumed.jsonl", "--resume") == 0, "resumed run failed")
+
+    full = (WORK_DIR / "full.jsonl").read_text(encoding='utf-8')
+    check((WORK_DIR / "resumed.jsonl").read_text(encoding='utf-8') == full, "resumed output differs")
+    check((WORK_DIR / "resumed.jsonl.summary").read_text(encoding='utf-8') ==
+          (WORK_DIR / "full.jsonl.summary").read_text(encoding='utf-8'), "resumed summary differs")
+
+    # Every input row is written in order with its fields, including the one without text
+    rows = [json.loads(line) for line in full.splitlines()]
+    check([row["row"] for row in rows] == list(range(10)), "rows missing or out of order")
+    check([row["stars"] for row in rows] == list(range(10)), "input fields not passed through")
+    check(rows[4]["label"] == "SKIPPED" and rows[4]["sentiment_score"] is None, f"empty row not marked: {rows[4]}")
+    summary = json.loads((WORK_DIR / "full.jsonl.summary").read_text(encoding='utf-8'))
+    check(sum(product["review_count"] for product in summary) == 9, "skipped row counted in the summary")
+    print("✅ score_reviews resume")
+    return True
+
+class RecordingPipeline(inference.StubSentimentPipeline):
+    """Stub pipeline that records its batches and fails any batch with a text containing 'fail'"""
+
+    def __init__(self):
+        self.batches: List[List[str]] = []
+
+    def __call__(self, texts: List[str], **kwargs) -> List[List[Dict]]:
+        self.batches.append(list(texts))
+        if any("fail" in text for text in texts):
+            raise ValueError("cannot score this text")
+        return super().__call__(texts, **kwargs)
+
+def expected_scores(texts: List[str]) -> List[float]:
+    return [result[1]['score'] for result in inference.StubSentimentPipeline()(texts)]
+
+def score_concurrently(queue: inference.InferenceQueue, requests: List[List[str]]) -> List[object]:
+    """Score each request from its own thread, returning its scores or the exception raised"""
+    outcomes: List[object] = [None] * len(requests)
+
+    def submit(i: int):
+        try:
+            outcomes[i] = queue.score(requests[i])
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(requests))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    return outcomes
+
+def test_inference_queue():
+    """Micro-batching across callers, per-request failures, lane retirement and metrics"""
+    pipeline = inference.sentiment_pipeline = RecordingPipeline()
+
+    # Texts from concurrent callers share one model pass and come back in order
+    queue = inference.InProcessInference(max_batch_size=6, batch_window_ms=2000)
+    queue.start()
+    first, second = ["great phone", "bad battery", "good camera"], ["worst purchase", "love it", "slow and poor"]
+    outcomes = score_concurrently(queue, [first, second])
+    check(len(pipeline.batches) == 1 and sorted(pipeline.batches[0]) == sorted(first + second),
+          f"callers not batched together: {pipeline.batches}")
+    check(outcomes == [expected_scores(first), expected_scores(second)], f"scores misrouted: {outcomes}")
+
+    metrics = queue.metrics()
+    check(metrics['batches'] == 1 and metrics['texts_scored'] == 6 and metrics['requests'] == 2,
+          f"unexpected counters: {metrics}")
+    check(metrics['average_batch_size'] == 6 and metrics['batch_fill_ratio'] == 1.0, f"unexpected fill: {metrics}")
+    check(metrics['healthy'] and metrics['live_lanes'] == 1 and metrics['queue_depth'] == 0, f"unhealthy: {metrics}")
+    check(metrics['latency_p50_ms'] is not None and metrics['latency_p99_ms'] >= metrics['latency_p50_ms'],
+          f"latency percentiles missing: {metrics}")
+
+    # A failing text in a shared batch only fails its own caller
+    pipeline.batches.clear()
+    outcomes = score_concurrently(queue, [["great phone", "please fail"], ["love it", "good camera", "fast"]])
+    check(isinstance(outcomes[0], RuntimeError) and "cannot score" in str(outcomes[0]),
+          f"failing request not reported: {outcomes[0]!r}")
+    check(outcomes[1] == expected_scores(["love it", "good camera", "fast"]), f"other caller failed: {outcomes[1]!r}")
+    check(len(pipeline.batches) == 3, f"expected a shared batch and two retries: {pipeline.batches}")
+    queue.close()
+
+    # A lane whose backend dies is retired, failing queued texts and later requests
+    class DyingInference(inference.InProcessInference):
+        alive = True
+
+        def _lane_alive(self, lane: int) -> bool:
+            return self.alive
+
+    queue = DyingInference(max_batch_size=1, batch_window_ms=0)
+    queue.start()
+    check(queue.score(["great phone"]) == expected_scores(["great phone"]), "live lane did not score")
+    queue.alive = False
+    try:
+        queue.score(["good camera", "love it"])  # The lane stops after the first text
+        check(False, "request orphaned by the last lane did not fail")
+    except RuntimeError as e:
+        check("No inference lanes" in str(e), f"unexpected error: {e}")
+    queue._threads[0].join(timeout=10)
+    check(not queue.healthy and queue.metrics()['live_lanes'] == 0, "retired lane still counted")
+    try:
+        queue.score(["great phone"])
+        check(False, "request accepted with no lanes")
+    except RuntimeError:
+        pass
+    queue.close()
+    print("✅ inference queue")
+    return True
+
+class FakeTokenizer:
+    """Tokenizer stand-in encoding each text as one token: 0 for "hang", else its length"""
+
+    @classmethod
+    def from_pretrained(cls, *args, **kwargs) -> "FakeTokenizer":
+        return cls()
+
+    def __call__(self, texts: List[str], **kwargs) -> Dict:
+        import numpy as np
+
+        input_ids = np.array([[0 if text == "hang" else len(text)] for text in texts], dtype=np.int64)
+        return {'input_ids': input_ids, 'attention_mask': np.ones_like(input_ids)}
+
+def fake_inference_worker(worker_index: int, slot_name: str, max_batch_size: int, max_length: int,
+                          threads: int, artifact_dir: str, requests_queue, results_queue):
+    """Inference worker scoring token / 100 that never replies to a batch starting with token 0"""
+    slot = inference._SharedBatchSlot(max_batch_size, max_length, name=slot_name)
+    results_queue.put(None)  # Ready
+    try:
+        while True:
+            message = requests_queue.get()
+            if message is None:
+                break
+            batch_size, _ = message
+            if slot.input_ids[0, 0] == 0:
+                time.sleep(60)
+            slot.scores[:batch_size] = slot.input_ids[:batch_size, 0] / 100.0
+            results_queue.put(None)
+    finally:
+        slot.close()
+
+def rounded(scores: List[float]) -> List[float]:
+    return [round(score, 4) for score in scores]  # Workers return float32 scores
+
+class MultilingualPipeline:
+    """Stub multilingual pipeline with positive/negative labels that records its texts"""
+
+    def __init__(self):
+        self.texts: List[str] = []
+
+    def __call__(self, texts: List[str], **kwargs) -> List[List[Dict]]:
+        self.texts.extend(texts)
+        return [[{'label': 'positive', 'score': 0.9}, {'label': 'negative', 'score': 0.1}] for _ in texts]
+
+class ListScraper:
+    request_delay = 0
+
+    def __init__(self, reviews: List[str]):
+        self.reviews = reviews
+
+    def get_product_reviews(self, asin: str, max_reviews: int = 50) -> List[str]:
+        return self.reviews
+
+def test_aspect_routing():
+    """Routed reviews are scored by the multilingual model and kept out of the English aspect pass"""
+    english = ["The battery is good and lasts all day. The camera is bad in low light and the display is dim.",
+               "Battery life is excellent and charging is fast"]
+    hinglish = "battery bahut accha hai lekin camera bekar hai. display bhi kharab hai yaar"
+    pipeline = inference.sentiment_pipeline = RecordingPipeline()
+    multilingual = inference.multilingual_pipeline = MultilingualPipeline()
+    original_model = text_module.MULTILINGUAL_MODEL_NAME
+    text_module.MULTILINGUAL_MODEL_NAME = "stub-multilingual"
+    try:
+        phone = ProductRecord("Test Phone X1 (Black)", "https://www.amazon.in/dp/B0ASPECT01", "₹9,999", 4.0, 1)
+        scored = score_smartphone(ListScraper(english + [hinglish]), phone)
+        english_texts = [text for batch in pipeline.batches for text in batch]
+        check(multilingual.texts == [hinglish], f"routed review not sent to the multilingual model: {multilingual.texts}")
+        check(all(detect_review_language(text) == 'en' for text in english_texts),
+              f"non-English text sent to the English model: {english_texts}")
+        check(scored.review_count == 3 and scored.aspects and {'battery', 'camera', 'display'} <= set(scored.aspects),
+              f"unexpected result: {scored.review_count} reviews, aspects {scored.aspects}")
+        check(scored.aspects['battery']['mentions'] == 2, f"routed sentence counted: {scored.aspects['battery']}")
+
+        # Reusing the stored reviews keeps the routed one out of the aspect pass as well
+        pipeline.batches.clear()
+        reused = score_smartphone(ListScraper([]), phone)
+        english_texts = [text for batch in pipeline.batches for text in batch]
+        check(reused.review_count == 3 and reused.aspects == scored.aspects,
+              f"stored reviews scored differently: {reused.aspects}")
+        check(all(detect_review_language(text) == 'en' for text in english_texts),
+              f"stored non-English text sent to the English model: {english_texts}")
+    finally:
+        text_module.MULTILINGUAL_MODEL_NAME = original_model
+        inference.multilingual_pipeline = None
+    print("✅ aspect routing")
+    return True
+
+def test_inference_pool_restart():
+    """A worker that times out is replaced and its lane keeps scoring"""
+    fake_transformers = types.ModuleType("transformers")
+    fake_transformers.AutoTokenizer = FakeTokenizer
+    patched = {'ensure_model_artifacts': lambda *args: WORK_DIR, '_inference_worker_main': fake_inference_worker}
+    originals = {name: getattr(inference, name) for name in list(patched) + ['INFERENCE_TIMEOUT']}
+    sys.modules['transformers'] = fake_transformers
+    for name, value in patched.items():
+        setattr(inference, name, value)
+
+    pool = inference.InferencePool(2, 1, max_batch_size=4, batch_window_ms=0, max_length=4)
+    try:
+        pool.start()
+        check(len({id(tokenizer) for tokenizer in pool._tokenizers}) == 2, "lanes share a tokenizer")
+        check(rounded(pool.score(["abc"])) == [0.03], "worker did not score")
+
+        # The caller and the lane both give up on the hung batch; the lane then restarts its worker
+        processes = list(pool._processes)
+        inference.INFERENCE_TIMEOUT = 2
+        try:
+            pool.score(["hang"])
+            check(False, "hung batch returned scores")
+        except (RuntimeError, TimeoutError):
+            pass
+        inference.INFERENCE_TIMEOUT = originals['INFERENCE_TIMEOUT']
+
+        deadline = time.monotonic() + 60
+        while pool._processes == processes and time.monotonic() < deadline:
+            time.sleep(0.1)
+        restarted = [lane for lane in range(2) if pool._processes[lane] is not processes[lane]]
+        check(len(restarted) == 1 and not processes[restarted[0]].is_alive(), "hung worker was not replaced")
+        check(rounded(pool.score(["abcde", "ab"])) == [0.05, 0.02], "pool did not score after the restart")
+        check(pool.healthy and pool.metrics()['live_lanes'] == 2, f"lane lost: {pool.metrics()}")
+    finally:
+        pool.close()
+        sys.modules.pop('transformers', None)
+        for name, value in originals.items():
+            setattr(inference, name, value)
+    print("✅ inference pool restart")
+    return True
+
+def main() -> int:
+    tests = [
+        ("Deduplication", test_deduplication),
+        ("Language and Review Filter", test_language_and_review_filter),
+        ("Product Identity", test_product_identity),
+        ("Price Parsing", test_parse_price),
+        ("Ranking Index", test_ranking_index),
+        ("History Round Trip", test_history_round_trip),
+        ("Review Store Round Trip", test_review_store_round_trip),
+        ("Score Reviews Resume", test_score_reviews_resume),
+        ("Inference Queue", test_inference_queue),
+        ("Aspect Routing", test_aspect_routing),
+        ("Inference Pool Restart", test_inference_pool_restart),
+    ]
+
+    results = {}
+    for test_name, test_func in tests:
+        try:
+            results[test_name] = test_func()
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results[test_name] = False
+
+    passed = sum(results.values())
+    print(f"\nOverall: {passed}/{len(results)} checks passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())